@@ -0,0 +1,123 @@
+import numpy as np
+from scipy import stats
+from scipy.optimize import curve_fit
+
+
+# Lognormal fragility curve, as fitted in fragility_setup.ipynb (loc = 0)
+def lognormal_fragility(fire_load, median, beta):
+    return stats.norm.cdf(np.log(fire_load / median) / beta)
+
+
+# Adaptive choice of fire loads for one fragility curve
+class AdaptiveFireLoadSearch:
+    # inputs: evaluate(fire_load) -> pf (e.g. one Dakota study),
+    #         fire_load_min, fire_load_max: search interval (MJ/m^2),
+    #         resolution: fire loads are rounded to multiples of it (MJ/m^2),
+    #         bracket_tolerance: width to which the pf = 0 and pf = 1 edges are bisected (MJ/m^2),
+    #         target_cov: stop once the coefficients of variation of the fitted median and beta are below it,
+    #         max_evaluations: evaluation budget
+    # outputs (after run()): .fire_loads, .pf (sorted by fire load), .median, .beta, .covariance,
+    #                        .converged, .lower_edge, .upper_edge (bracket of the transition region)
+    def __init__(
+        self,
+        evaluate,
+        fire_load_min=100,
+        fire_load_max=4000,
+        resolution=50,
+        bracket_tolerance=200,
+        target_cov=0.1,
+        max_evaluations=20,
+    ):
+        self.evaluate = evaluate
+        self.fire_load_min = fire_load_min
+        self.fire_load_max = fire_load_max
+        self.resolution = resolution
+        self.bracket_tolerance = bracket_tolerance
+        self.target_cov = target_cov
+        self.max_evaluations = max_evaluations
+        self.evaluated = {}
+        self.median = np.nan
+        self.beta = np.nan
+        self.covariance = np.full((2, 2), np.inf)
+        self.converged = False
+
+    def pf_at(self, fire_load):
+        fire_load = float(np.clip(
+            np.round(fire_load / self.resolution) * self.resolution, self.fire_load_min, self.fire_load_max
+        ))
+        if fire_load not in self.evaluated:
+            self.evaluated[fire_load] = self.evaluate(fire_load)
+        return self.evaluated[fire_load]
+
+    def bisect_edge(self, below, above):
+        # below(pf), above(pf): which side of the edge a point lies on; pf is assumed to increase with fire load
+        while len(self.evaluated) < self.max_evaluations:
+            lower = max([x for x, pf in self.evaluated.items() if below(pf)], default=None)
+            upper = min([x for x, pf in self.evaluated.items() if above(pf) and (lower is None or x > lower)], default=None)
+            if lower is None or upper is None or upper - lower <= self.bracket_tolerance:
+                break
+            middle = np.round((lower + upper) / 2 / self.resolution) * self.resolution
+            if middle in (lower, upper):
+                break
+            self.pf_at(middle)
+
+    def fit(self):
+        fire_loads = np.array(sorted(self.evaluated))
+        pf = np.array([self.evaluated[x] for x in fire_loads])
+        if len(fire_loads) < 3:
+            return False
+        p0 = [np.interp(0.5, pf, fire_loads), 0.3] if np.all(np.diff(pf) >= 0) else [np.median(fire_loads), 0.3]
+        try:
+            popt, pcov = curve_fit(
+                lognormal_fragility, fire_loads, pf, p0=p0, bounds=([1e-6, 1e-6], [np.inf, np.inf])
+            )
+        except (RuntimeError, ValueError):
+            return False
+        self.median, self.beta = popt
+        self.covariance = pcov
+        return np.all(np.isfinite(pcov))
+
+    def prediction_variance(self, fire_load):
+        # variance of the fitted pf(fire_load) from the parameter covariance (delta method)
+        z = np.log(fire_load / self.median) / self.beta
+        density = stats.norm.pdf(z)
+        gradient = np.stack([-density / (self.median * self.beta), -density * z / self.beta])
+        return np.einsum("i...,ij,j...->...", gradient, self.covariance, gradient)
+
+    def run(self):
+        # 1. ends of the search interval, then the pf = 0 and pf = 1 edges by bisection
+        self.pf_at(self.fire_load_max)
+        self.pf_at(self.fire_load_min)
+        self.bisect_edge(below=lambda pf: pf == 0, above=lambda pf: pf > 0)
+        self.bisect_edge(below=lambda pf: pf < 1, above=lambda pf: pf == 1)
+        self.lower_edge = max([x for x, pf in self.evaluated.items() if pf == 0], default=self.fire_load_min)
+        self.upper_edge = min(
+            [x for x, pf in self.evaluated.items() if pf == 1 and x > self.lower_edge], default=self.fire_load_max
+        )
+
+        # 2. evaluations where the fitted curve is most uncertain, until its parameters are accurate enough
+        while True:
+            fitted = self.fit()
+            if fitted:
+                cov = np.sqrt(np.diag(self.covariance)) / np.array([self.median, self.beta])
+                if np.all(cov < self.target_cov):
+                    self.converged = True
+                    break
+            if len(self.evaluated) >= self.max_evaluations:
+                break
+            candidates = np.arange(self.lower_edge, self.upper_edge + self.resolution / 2, self.resolution)
+            candidates = np.array([x for x in candidates if float(x) not in self.evaluated])
+            if candidates.size == 0:
+                break
+            if fitted:
+                next_fire_load = candidates[np.argmax(self.prediction_variance(candidates))]
+            else:
+                # no usable fit yet: split the widest gap between evaluated points of the transition region
+                points = np.array(sorted(x for x in self.evaluated if self.lower_edge <= x <= self.upper_edge))
+                gap = np.argmax(np.diff(points))
+                next_fire_load = (points[gap] + points[gap + 1]) / 2
+            self.pf_at(next_fire_load)
+
+        self.fire_loads = np.array(sorted(self.evaluated))
+        self.pf = np.array([self.evaluated[x] for x in self.fire_loads])
+        return self
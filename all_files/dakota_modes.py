@@ -0,0 +1,481 @@
+# Dakota modes of the fragility sweep (see fragility_analysis): each study runs Dakota in a run directory of
+# its own, evaluating its samples with the column analysis modules of the source's templatedir
+from pathlib import Path
+import subprocess
+import shlex
+import os
+import sys
+import shutil
+import tempfile
+import time
+from functools import partial
+import pandas as pd
+import numpy as np
+import sweep_scheduler
+from result_store import ResultStore
+from adaptive_fire_load import AdaptiveFireLoadSearch
+from dakota_tabular import read_tabular, read_tabular_header
+
+# environment variable naming the evaluation server's socket for the drivers (as in evaluation_server)
+evaluation_socket_variable = "COLUMN_EVALUATION_SOCKET"
+
+
+# Function to extract the failure probability from a specified file
+def extract_failure_probability(filename="dakotaTab.out"):
+    data_array = read_tabular(filename)  # Values from index 2 onwards as floats
+    failure_probability = np.mean(data_array[:, -1])  # Calculate the mean of the last column (failure probabilities)
+    return failure_probability, data_array
+
+
+# Function to extract each sample's critical demand-to-capacity ratio from a specified file
+def extract_critical_DCR(filename="dakotaTab.out"):
+    # read_tabular holds the columns from index 2 onwards
+    return read_tabular(filename)[:, read_tabular_header(filename).index("critical_DCR")]
+
+
+# Function to extract the failure probability of each grid point of a grouped study (see configure_grid_points)
+def extract_grid_failure_probabilities(filename="dakotaTab.out"):
+    columns = read_tabular_header(filename)
+    indices = [i for i, column in enumerate(columns) if column.startswith("failure_indicator_")]
+    return np.mean(read_tabular(filename)[:, indices], axis=0)
+
+
+# Function to compute the failure probability of every DCR from the sampled critical DCRs
+def fragility_from_critical_DCR(critical_DCR, DC_ratios):
+    # a sample fails when DCR >= its critical DCR, so pf(DCR) is the empirical CDF of critical_DCR
+    return np.mean(critical_DCR[None, :] <= np.asarray(DC_ratios)[:, None], axis=1)
+
+
+# Function to configure the analysis based on given variable values
+def configure_analysis(var_values_list, filename="templatedir/column_config.py"):
+    var_name_list = ["DCR", "L", "e", "section_size", "fire_load_fuel_energy_density"]
+
+    # Reading the template configuration file
+    with open(filename, "r") as file:
+        data = file.readlines()
+
+    new_data = []
+    for line in data:
+        for i, var_name in enumerate(var_name_list):
+            if f"<{var_name}>" in line:  # Replace placeholders with actual values
+                if var_name == "section_size":
+                    line = line.replace(f"<{var_name}>", f"'{var_values_list[i]}'")
+                else:
+                    line = line.replace(f"<{var_name}>", str(var_values_list[i]))
+                new_data.append(line)
+                break
+    # Writing the modified configuration back to the file
+    with open(filename, "w") as file:
+        file.writelines(new_data)
+
+
+# Function to make a Dakota study check every sample at several grid points (DCR, e, L in ft) of the same
+# section and fire load, with one failure_indicator_<i> response per grid point (see column_analysis.grid_point_responses)
+def configure_grid_points(grid_points, config_filename="templatedir/column_config.py", filename="dakota.in"):
+    with open(config_filename, "a") as file:
+        values = ", ".join(f"({float(DCR)}, {float(e)}, {float(L)} / 3.281)" for DCR, e, L in grid_points)
+        file.write(f"\ngrid_points = [{values}]  # (DCR, e, L in m)\n")  # the template may not end in a newline
+    with open(filename, "r") as file:
+        data = file.readlines()
+    for i, line in enumerate(data):
+        if line.strip().startswith("response_functions"):
+            data[i] = f" response_functions = {len(grid_points)}\n"
+        elif line.strip().startswith("response_descriptors"):
+            descriptors = " ".join(f"'failure_indicator_{i}'" for i in range(1, len(grid_points) + 1))
+            data[i] = f" response_descriptors = {descriptors}\n"
+    with open(filename, "w") as file:
+        file.writelines(data)
+
+
+# Function to set how many samples a Dakota study evaluates at the same time
+def configure_concurrency(evaluation_concurrency, filename="dakota.in"):
+    with open(filename, "r") as file:
+        data = file.readlines()
+    for i, line in enumerate(data):
+        if line.strip().startswith("asynchronous"):
+            data[i] = f"  asynchronous evaluation_concurrency = {evaluation_concurrency}\n"
+    with open(filename, "w") as file:
+        file.writelines(data)
+
+
+# Function to switch a Dakota study from one driver process per sample (fork) to Dakota's batch interface,
+# which hands all the study's samples to one batch_driver process (see batch_evaluation); the rewritten
+# interface block ("fork batch" with work_directory and link_files) has only been run against a stand-in
+# for Dakota so far, so check it with "dakota -check" on the cluster's Dakota before making it the default
+def configure_batch(filename="dakota.in"):
+    with open(filename, "r") as file:
+        data = file.readlines()
+    for i, line in enumerate(data):
+        if line.strip().startswith("analysis_driver"):
+            data[i] = "  analysis_driver = 'batch_driver'\n"
+        elif line.strip() == "fork":
+            data[i] = "  fork batch\n"
+        elif line.strip().startswith("link_files"):
+            data[i] = line.replace("'templatedir/workflow_driver1'", "'templatedir/batch_driver'")
+        elif line.strip().startswith("asynchronous"):
+            # no concurrency limit: Dakota batches every pending evaluation, i.e. the whole sample set
+            data[i] = "  asynchronous\n"
+    with open(filename, "w") as file:
+        file.writelines(data)
+
+
+# Function to set up a run directory that shares the source's files through symlinks; only the files
+# a run edits are real copies (Dakota's work directories link the few files a sample needs from it)
+def make_run_directory(source, destination, copied=("dakota.in", "templatedir/column_config.py")):
+    copied = {Path(name) for name in copied}
+    copied_directories = {parent for name in copied for parent in name.parents if parent != Path(".")}
+
+    def populate(relative):
+        (destination / relative).mkdir(parents=True, exist_ok=True)
+        for entry in (source / relative).iterdir():
+            name = relative / entry.name
+            if name in copied_directories:
+                populate(name)
+            elif name in copied:
+                shutil.copy2(entry, destination / name)
+            else:
+                (destination / name).symlink_to(entry.resolve())
+
+    populate(Path("."))
+
+
+# Function to start an evaluation server on the analysis modules of the source's templatedir,
+# for the drivers of one Dakota study (see evaluation_server); returns the process and its socket path
+def start_evaluation_server(source, timeout=60):
+    # node-local temporary directory: Unix socket paths are limited to ~100 characters
+    socket_path = Path(tempfile.mkdtemp(prefix="column_evaluation_")) / "server.sock"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "evaluation_server", "serve", str(socket_path)],
+        env={**os.environ, "PYTHONPATH": str(source / "templatedir")},
+    )
+    start = time.time()
+    while not socket_path.exists() and server.poll() is None and time.time() - start < timeout:
+        time.sleep(0.05)
+    return server, socket_path
+
+
+# Function to run one Dakota study in a fresh run directory of the source directory
+def run_analysis(
+    source,
+    destination,
+    var_values_list,
+    extract=extract_failure_probability,
+    command="ibrun dakota -input dakota.in -output dakota.out -error dakota.err",
+    evaluation_concurrency=None,
+    evaluation_server=False,
+    batch=False,
+    grid_points=None,
+):
+    # evaluation_server: evaluate the study's samples on a long-lived server process rather than a fresh
+    # Python process per sample (its drivers must run on this node, e.g. a plain "dakota" command)
+    # batch: evaluate all the study's samples in one vectorized process through Dakota's batch interface
+    # grid_points: check the samples at each of these (DCR, e, L) (see configure_grid_points)
+
+    # Prepare directory for analysis
+    if destination.is_dir():
+        shutil.rmtree(destination, ignore_errors=True)
+    make_run_directory(source, destination)
+
+    server = None
+    try:
+        # Change directory to the destination and configure the analysis
+        os.chdir(destination)
+        configure_analysis(var_values_list)
+        if grid_points is not None:
+            configure_grid_points(grid_points)
+        if batch:
+            configure_batch()
+        elif evaluation_concurrency is not None:
+            configure_concurrency(evaluation_concurrency)
+
+        # Run the analysis using a shell command
+        env = dict(os.environ)
+        if evaluation_server:
+            server, socket_path = start_evaluation_server(source)
+            env[evaluation_socket_variable] = str(socket_path)
+        command_list = shlex.split(command)
+        subprocess.run(command_list, env=env)
+
+        # Extract the results
+        results = extract()
+    finally:
+        # Cleanup after the analysis, also when it failed (rmtree removes the symlinks, not their targets)
+        if server is not None:
+            server.terminate()
+            server.wait()
+            shutil.rmtree(socket_path.parent, ignore_errors=True)
+        os.chdir(destination.parent)
+        shutil.rmtree(destination, ignore_errors=True)
+    return results
+
+
+# Function to run one task of the parallel sweep (see sweep_scheduler)
+def run_task(task, source, fragility_mode, DC_ratios, evaluation_concurrency, dakota_interface="fork"):
+    # each task runs its own serial Dakota process, which evaluates its samples in one batch process
+    # (dakota_interface "batch") or per sample on an evaluation server ("fork"); the process pool
+    # provides the parallelism
+    command = "dakota -input dakota.in -output dakota.out -error dakota.err"
+    destination = source.parent / f"analysis_{task.name}"
+    if fragility_mode == "critical_DCR":
+        critical_DCR = run_analysis(
+            source,
+            destination,
+            task.var_values_list,
+            extract_critical_DCR,
+            command,
+            evaluation_concurrency,
+            evaluation_server=dakota_interface == "fork",
+            batch=dakota_interface == "batch",
+        )
+        return fragility_from_critical_DCR(critical_DCR, DC_ratios)
+    pf, _ = run_analysis(
+        source,
+        destination,
+        task.var_values_list,
+        extract_failure_probability,
+        command,
+        evaluation_concurrency,
+        evaluation_server=dakota_interface == "fork",
+        batch=dakota_interface == "batch",
+    )
+    return pf
+
+
+# Function to run one group of per_DCR studies of the parallel sweep as one Dakota study (see sweep_scheduler.group_tasks)
+def run_group_task(group, source, evaluation_concurrency, dakota_interface="fork"):
+    # the fire and thermal analyses of each sample are shared by all the group's grid points, whose
+    # failure probabilities are returned in the order of group.tasks
+    command = "dakota -input dakota.in -output dakota.out -error dakota.err"
+    return run_analysis(
+        source,
+        source.parent / f"analysis_{group.name}",
+        group.var_values_list,
+        extract_grid_failure_probabilities,
+        command,
+        evaluation_concurrency,
+        evaluation_server=dakota_interface == "fork",
+        batch=dakota_interface == "batch",
+        grid_points=group.grid_points,
+    )
+
+
+# Function to run the adaptive fire load searches of one section size (see adaptive_fire_load)
+def run_adaptive_task(
+    task, source, eccentricities, lengths, DC_ratios, evaluation_concurrency, store_path, dakota_interface="fork"
+):
+    # a critical_DCR study at one fire load gives pf for every DCR, e and L; each study is stored as it
+    # completes, so the searches of the different DCRs share the fire loads they have in common and a
+    # rerun of the job replays its searches from the store
+    command = "dakota -input dakota.in -output dakota.out -error dakota.err"
+    store = ResultStore(store_path)
+    stored = store.load()
+
+    def evaluate(DCR, fire_load):
+        key = ResultStore.key(task.section_size, task.e, task.L, DCR, fire_load)
+        if key not in stored:
+            study = sweep_scheduler.SweepTask(task.section_size, task.e, task.L, None, fire_load, int(fire_load))
+            critical_DCR = run_analysis(
+                source,
+                source.parent / f"analysis_{study.name}",
+                study.var_values_list,
+                extract_critical_DCR,
+                command,
+                evaluation_concurrency,
+                evaluation_server=dakota_interface == "fork",
+                batch=dakota_interface == "batch",
+            )
+            rows = [
+                (task.section_size, e, L, DCR_value, fire_load, pf)
+                for e in eccentricities
+                for L in lengths
+                for DCR_value, pf in zip(DC_ratios, fragility_from_critical_DCR(critical_DCR, DC_ratios))
+            ]
+            store.put(rows)
+            stored.update({ResultStore.key(*row[:5]): row[5] for row in rows})
+        return stored[key]
+
+    summaries = []
+    for DCR in DC_ratios:
+        search = AdaptiveFireLoadSearch(partial(evaluate, DCR)).run()
+        summaries.append(
+            {
+                "fire_loads": search.fire_loads,
+                "median": search.median,
+                "beta": search.beta,
+                "median_std": np.sqrt(search.covariance[0, 0]),
+                "beta_std": np.sqrt(search.covariance[1, 1]),
+                "evaluations": len(search.fire_loads),
+                "converged": search.converged,
+            }
+        )
+    store.close()
+    return summaries
+
+
+
+# Function to run the critical_DCR or per_DCR sweep on a process pool sized to the node and write
+# results_{section}.csv for each section size
+def run_grid_sweep(
+    source, section_size_list, eccentricities, lengths, DC_ratios, fire_loads, fragility_mode, dakota_interface, on_failure
+):
+    # Expand the grid into independent Dakota studies; with fewer studies than cores, each study evaluates
+    # several samples at the same time
+    tasks = sweep_scheduler.expand_grid(section_size_list, eccentricities, lengths, DC_ratios, fire_loads, fragility_mode)
+    if fragility_mode == "critical_DCR":
+        zero = np.zeros(len(DC_ratios))
+        missing = np.full(len(DC_ratios), np.nan)  # pf of a failed study
+        is_zero = lambda pf: np.all(pf == 0)  # Stop once no DCR fails
+    else:
+        zero = 0.0
+        missing = np.nan
+        is_zero = lambda pf: pf == 0  # Stop if failure probability is zero
+
+    # Every result is committed to the store as it completes; results of an earlier (e.g. timed out)
+    # run of this job are read back and their studies skipped
+    store = ResultStore("results.sqlite")
+
+    def task_rows(task, result):
+        # (section_size, e, L, DCR, fire_load, pf) rows covered by one task's result
+        if fragility_mode == "critical_DCR":
+            return [
+                (task.section_size, e, L, DCR, task.fire_load, pf)
+                for e in eccentricities
+                for L in lengths
+                for DCR, pf in zip(DC_ratios, result)
+            ]
+        return [(task.section_size, task.e, task.L, task.DCR, task.fire_load, result)]
+
+    stored = store.load()
+    results = {}
+    for task in tasks:
+        keys = [ResultStore.key(*row[:5]) for row in task_rows(task, zero)]
+        if all(key in stored for key in keys):
+            pf = np.array([stored[key] for key in keys])
+            results[task.name] = pf[: len(DC_ratios)] if fragility_mode == "critical_DCR" else pf[0]
+    pending = sweep_scheduler.pending_tasks(tasks, results, is_zero)
+    print(f"{len(tasks) - len(pending)} of {len(tasks)} studies already done")
+
+    cores = sweep_scheduler.node_cores()
+    if fragility_mode == "per_DCR":
+        # the studies that share a section and fire load run as one Dakota study, whose samples' fire and
+        # thermal analyses serve all its (e, L, DCR) grid points
+        groups = sweep_scheduler.group_tasks(pending)
+        evaluation_concurrency = max(1, cores // max(1, len(groups)))
+
+        def store_group(group, result):
+            for task, pf in zip(group.tasks, result):
+                store.put(task_rows(task, pf))
+
+        group_results = sweep_scheduler.run_sweep(
+            groups,
+            partial(
+                run_group_task,
+                source=source,
+                evaluation_concurrency=evaluation_concurrency,
+                dakota_interface=dakota_interface,
+            ),
+            max_workers=min(cores, max(1, len(groups))),
+            is_zero=lambda pf: np.all(pf == 0),  # Stop once none of the group's grid points fails
+            on_result=store_group,
+            on_failure=on_failure,
+        )
+        for group in groups:
+            if group.name in group_results:
+                results.update(zip((task.name for task in group.tasks), group_results[group.name]))
+    else:
+        evaluation_concurrency = max(1, cores // max(1, len(pending)))
+        results.update(
+            sweep_scheduler.run_sweep(
+                pending,
+                partial(
+                    run_task,
+                    source=source,
+                    fragility_mode=fragility_mode,
+                    DC_ratios=DC_ratios,
+                    evaluation_concurrency=evaluation_concurrency,
+                    dakota_interface=dakota_interface,
+                ),
+                max_workers=min(cores, max(1, len(pending))),
+                is_zero=is_zero,
+                on_result=lambda task, result: store.put(task_rows(task, result)),
+                on_failure=on_failure,
+            )
+        )
+    store.close()
+
+    # Collect the results of each section size
+    for section_size in section_size_list:
+        res_dict = {}
+        if fragility_mode == "critical_DCR":
+            section_tasks = [task for task in tasks if task.section_size == section_size]
+            # failure probabilities, one row per DCR
+            pf_matrix = np.column_stack(sweep_scheduler.series_results(section_tasks, results, is_zero, zero, missing))
+            for e in eccentricities:
+                for L in lengths:
+                    for i, DCR in enumerate(DC_ratios):
+                        key = f"{section_size}_{e:.3f}_{L}_{DCR:.2f}"
+                        res_dict[key] = pf_matrix[i]
+        else:
+            for e in eccentricities:
+                for L in lengths:
+                    for DCR in DC_ratios:
+                        series_tasks = [task for task in tasks if task.series == (section_size, e, L, DCR)]
+                        pf_array = np.array(sweep_scheduler.series_results(series_tasks, results, is_zero, zero, missing))
+
+                        # Store the results in a dictionary
+                        key = f"{section_size}_{e:.3f}_{L}_{DCR:.2f}"
+                        res_dict[key] = pf_array
+
+        # Convert results dictionary to a DataFrame and save as a CSV file
+        res_df = pd.DataFrame(res_dict)
+        res_df.insert(0, "fire_load", fire_loads)  # Insert fire load values as the first column
+        res_df.to_csv(f"results_{section_size}.csv", index=False)  # Save to CSV
+
+
+# Function to run the adaptive sweep, one process per section size, and write results_{section}.csv (pf at
+# every fire load any of the section's searches evaluated) and fragility_{section}.csv (the fitted
+# lognormal fragility parameters of each curve) for each section size
+def run_adaptive_sweep(source, section_size_list, eccentricities, lengths, DC_ratios, dakota_interface, on_failure):
+    # each process runs its section's DCR searches one after another
+    tasks = [
+        sweep_scheduler.SweepTask(section_size, eccentricities[0], lengths[0], None, None, 0)
+        for section_size in section_size_list
+    ]
+    cores = sweep_scheduler.node_cores()
+    searches = sweep_scheduler.run_sweep(
+        tasks,
+        partial(
+            run_adaptive_task,
+            source=source,
+            eccentricities=eccentricities,
+            lengths=lengths,
+            DC_ratios=DC_ratios,
+            evaluation_concurrency=max(1, cores // len(tasks)),
+            store_path=Path("results.sqlite").resolve(),
+            dakota_interface=dakota_interface,
+        ),
+        max_workers=min(cores, len(tasks)),
+        on_failure=on_failure,
+    )
+    store = ResultStore("results.sqlite")
+    stored = store.load()
+    store.close()
+
+    for task in [task for task in tasks if task.name in searches]:
+        section_size = task.section_size
+        summaries = searches[task.name]
+        section_fire_loads = sorted({x for summary in summaries for x in summary["fire_loads"]}, reverse=True)
+        res_dict = {}
+        fit_rows = []
+        for e in eccentricities:
+            for L in lengths:
+                for DCR, summary in zip(DC_ratios, summaries):
+                    key = f"{section_size}_{e:.3f}_{L}_{DCR:.2f}"
+                    res_dict[key] = [
+                        stored[ResultStore.key(section_size, e, L, DCR, fire_load)] for fire_load in section_fire_loads
+                    ]
+                    fit_rows.append({"key": key, **{name: value for name, value in summary.items() if name != "fire_loads"}})
+        res_df = pd.DataFrame(res_dict)
+        res_df.insert(0, "fire_load", section_fire_loads)
+        res_df.to_csv(f"results_{section_size}.csv", index=False)
+        pd.DataFrame(fit_rows).to_csv(f"fragility_{section_size}.csv", index=False)
@@ -0,0 +1,109 @@
+import warnings
+import numpy as np
+
+# fast reader and aggregator of Dakota tabular files (dakotaTab.out): the numeric columns (from
+# index 2 onwards, after %eval_id and interface) are parsed by numpy into one float64 array, exactly
+# as float() would, or chunk by chunk for studies too large to hold in memory
+
+
+# Function to read the column names of a tabular file (those of the numeric columns)
+def read_tabular_header(filename="dakotaTab.out"):
+    with open(filename, "r") as file:
+        return file.readline().split()[2:]
+
+
+# Function to read a tabular file into a float64 array of shape (evaluations, numeric columns)
+def read_tabular(filename="dakotaTab.out"):
+    columns = read_tabular_header(filename)
+    return np.loadtxt(filename, skiprows=1, usecols=range(2, 2 + len(columns)), ndmin=2)
+
+
+# Function to read a tabular file in chunks of at most chunk_size rows
+def iter_tabular_chunks(filename="dakotaTab.out", chunk_size=100000):
+    columns = read_tabular_header(filename)
+    with open(filename, "r") as file:
+        file.readline()
+        while True:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", UserWarning)  # raised for the empty read at the end of the file
+                chunk = np.loadtxt(file, usecols=range(2, 2 + len(columns)), max_rows=chunk_size, ndmin=2)
+            if chunk.shape[0] > 0:
+                yield chunk
+            if chunk.shape[0] < chunk_size:
+                return
+
+
+# Per-column statistics of one or more tabular files, accumulated chunk by chunk
+class TabularSummary:
+    # inputs: columns: names of the numeric columns (read_tabular_header)
+    # outputs: .count, .mean, .std (sample standard deviation), .min, .max per column,
+    #          .failure_probability(column) -> (pf, standard error), .statistics() -> {column: {...}}
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.count = 0
+        self.mean = np.zeros(len(self.columns))
+        self.sum_of_squares = np.zeros(len(self.columns))  # of deviations from the mean
+        self.min = np.full(len(self.columns), np.inf)
+        self.max = np.full(len(self.columns), -np.inf)
+
+    # Function to add the rows of a chunk (parallel update of Chan et al., exact for any chunking)
+    def add(self, chunk):
+        if chunk.shape[0] == 0:
+            return self
+        other = TabularSummary(self.columns)
+        other.count = chunk.shape[0]
+        other.mean = chunk.mean(axis=0)
+        other.sum_of_squares = ((chunk - other.mean) ** 2).sum(axis=0)
+        other.min = chunk.min(axis=0)
+        other.max = chunk.max(axis=0)
+        return self.merge(other)
+
+    # Function to merge the summary of other rows (e.g. of another file of the same study layout)
+    def merge(self, other):
+        if other.columns != self.columns:
+            raise ValueError(f"Columns {other.columns} do not match {self.columns}.")
+        count = self.count + other.count
+        if count == 0:
+            return self
+        delta = other.mean - self.mean
+        self.sum_of_squares = self.sum_of_squares + other.sum_of_squares + delta**2 * self.count * other.count / count
+        self.mean = self.mean + delta * other.count / count
+        self.count = count
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        return self
+
+    @property
+    def std(self):
+        return np.sqrt(self.sum_of_squares / (self.count - 1)) if self.count > 1 else np.full(len(self.columns), np.nan)
+
+    # Function to get pf (mean of a 0/1 failure indicator column) and its binomial standard error
+    def failure_probability(self, column=-1):
+        index = column if isinstance(column, int) else self.columns.index(column)
+        pf = self.mean[index]
+        return pf, np.sqrt(pf * (1 - pf) / self.count)
+
+    def statistics(self):
+        std = self.std
+        return {
+            column: {"count": self.count, "mean": self.mean[i], "std": std[i], "min": self.min[i], "max": self.max[i]}
+            for i, column in enumerate(self.columns)
+        }
+
+
+# Function to summarize one tabular file or merge many (e.g. the studies of a group run) in one call
+def summarize_tabular(filenames="dakotaTab.out", chunk_size=None):
+    # chunk_size: read each file in chunks of at most that many rows (None: whole files at once)
+    filenames = [filenames] if isinstance(filenames, (str, bytes)) or not np.iterable(filenames) else filenames
+    summary = None
+    for filename in filenames:
+        columns = read_tabular_header(filename)
+        summary = TabularSummary(columns) if summary is None else summary
+        if chunk_size is None:
+            summary.merge(TabularSummary(columns).add(read_tabular(filename)))
+        else:
+            file_summary = TabularSummary(columns)
+            for chunk in iter_tabular_chunks(filename, chunk_size):
+                file_summary.add(chunk)
+            summary.merge(file_summary)
+    return summary
@@ -3,54 +3,14 @@
 
 # Importing necessary libraries
 from pathlib import Path       
-import subprocess              
-import shlex                   
 import os                      
-import shutil                  
-import pandas as pd            
 import numpy as np             
+import pandas as pd            
+import dakota_modes
+import in_process_modes
 
-
-# Function to extract the failure probability from a specified file
-def extract_failure_probability(filename="dakotaTab.out"):
-    with open(filename, "r") as file:
-        data = file.readlines()
-
-    # Process the data into a list of lists and convert to a NumPy array
-    big_list = []
-    for line in data[1:]:  # Skip the first line
-        values = line.split()
-        row = [
-            float(value) for value in values[2:]
-        ]  # Convert values from index 2 onwards to floats
-        big_list.append(row)
-    data_array = np.array(big_list, dtype=np.float64)
-
-    failure_probability = np.mean(data_array[:, -1])  # Calculate the mean of the last column (failure probabilities)
-    return failure_probability, data_array
-
-
-# Function to configure the analysis based on given variable values
-def configure_analysis(var_values_list, filename="templatedir/column_config.py"):
-    var_name_list = ["DCR", "L", "e", "section_size", "fire_load_fuel_energy_density"]
-
-    # Reading the template configuration file
-    with open(filename, "r") as file:
-        data = file.readlines()
-
-    new_data = []
-    for line in data:
-        for i, var_name in enumerate(var_name_list):
-            if f"<{var_name}>" in line:  # Replace placeholders with actual values
-                if var_name == "section_size":
-                    line = line.replace(f"<{var_name}>", f"'{var_values_list[i]}'")
-                else:
-                    line = line.replace(f"<{var_name}>", str(var_values_list[i]))
-                new_data.append(line)
-                break
-    # Writing the modified configuration back to the file
-    with open(filename, "w") as file:
-        file.writelines(new_data)
+# environment variable naming the on-disk tier of the analyses' stage cache (as in stage_cache)
+stage_cache_variable = "COLUMN_STAGE_CACHE"
 
 
 # Main execution block
@@ -77,51 +37,82 @@ if __name__ == "__main__":
     DC_ratios = np.arange(0.95, 0, -0.05)  # Range of demand-to-capacity ratios decreasing from 0.95 to 0
     fire_loads = np.arange(4000, 2000, -300)  # Range of fire load values decreasing from 4000 to 2000
 
-    # Loop over each section size
-    for section_size in section_size_list:
-        res_dict = {}
-        for e in eccentricities:
-            for L in lengths:
-                for DCR in DC_ratios:
-                    pf_array = np.zeros(len(fire_loads))  # Initialize an array to store failure probabilities
-                    for num, fire_load in enumerate(fire_loads):
-                        var_values_list = [DCR, L, e, section_size, fire_load]  # List of current variable values
-                        
-                        # Prepare directory for analysis
-                        destination = source.parent / f"analysis_{num}"
-                        if destination.is_dir():
-                            shutil.rmtree(destination, ignore_errors=True)
-                        shutil.copytree(source, destination)
-                        
-                        # Change directory to the destination and configure the analysis
-                        template_dir = destination / "templatedir"
-                        os.chdir(destination)
-                        configure_analysis(var_values_list)
-                        
-                        # Run the analysis using a shell command
-                        command = "ibrun dakota -input dakota.in -output dakota.out -error dakota.err"
-                        command_list = shlex.split(command)
-                        subprocess.run(command_list)
-                        
-                        # Extract failure probability and store it
-                        pf, _ = extract_failure_probability()
-                        pf_array[num] = pf
-                        
-                        # Cleanup after the analysis
-                        os.chdir(destination.parent)
-                        shutil.rmtree(destination, ignore_errors=True)
-                        if pf == 0:  # Stop if failure probability is zero
-                            break
-                    
-                    # Store the results in a dictionary
-                    key = f"{section_size}_{e:.3f}_{L}_{DCR:.2f}"
-                    val = pf_array
-                    res_dict[key] = val
-        
-        # Convert results dictionary to a DataFrame and save as a CSV file
-        res_df = pd.DataFrame(res_dict)
-        res_df.insert(0, "fire_load", fire_loads)  # Insert fire load values as the first column
-        res_df.to_csv(f"results_{section_size}.csv", index=False)  # Save to CSV
+    # "critical_DCR": one Dakota study per (section, fire load); the sampled critical DCRs give pf
+    #                 for every DCR at once and, since neither e nor L enters the ratio
+    #                 min(capacity) / capacity[0], for every e and L as well
+    # "per_DCR": the failure indicator at each (section, e, L, DCR, fire load); the grid points of one
+    #            (section, fire load) share one Dakota study, checking each sample at all of them
+    # "adaptive": critical_DCR studies at fire loads chosen per curve instead of the fixed fire_loads grid:
+    #             bisection for the pf = 0 and pf = 1 edges, then where the fitted lognormal fragility
+    #             curve is most uncertain (see adaptive_fire_load); also writes fragility_{section}.csv
+    # "critical_fire_load": no Dakota studies; one in-process batched run per (section, DCR) solves each
+    #                       sample's critical fire load, whose empirical CDF gives pf at every fire load
+    #                       (see critical_fire_load); also writes critical_fire_loads_{section}.csv
+    # "common_random_numbers": no Dakota studies; the samples are drawn once per section and every grid
+    #                          point is evaluated on them in-process (see column_analysis.ColumnSampleDesign)
+    # "sequential": as common_random_numbers, but each grid point adds batches of samples until its pf is
+    #               known to the target confidence interval width (see sequential_sampling); also writes
+    #               samples_{section}.csv with the number of samples used at each grid point
+    # "subset_simulation": no Dakota studies; each grid point's pf is estimated by subset simulation on the
+    #                      capacity ratio limit state, resolving pf down to ~1e-4 (see subset_simulation);
+    #                      samples_{section}.csv holds the column analyses used at each grid point
+    # "form": no Dakota studies; first-order pf of each grid point from its design point on the capacity
+    #         ratio limit state, for screening (see form_sorm); reliability_{section}.csv also holds beta,
+    #         the SORM pf and the importance factors of the random variables
+    fragility_mode = "critical_DCR"
+    # how the Dakota modes (critical_DCR, per_DCR, adaptive) evaluate a study's samples:
+    # "fork": one driver process per sample, served by a preloaded evaluation server (see evaluation_server)
+    # "batch": all samples in one vectorized process (Dakota's batch interface, see batch_evaluation); not yet
+    #          checked against a real Dakota (see dakota_modes.configure_batch), hence fork is the default
+    dakota_interface = "fork"
+
+    # the fire curves, steel temperatures and moduli of every analysis are memoized in memory within a process
+    # (see stage_cache); setting $COLUMN_STAGE_CACHE to a directory also shares them on disk between the
+    # drivers, batch processes and reruns, which pays off only when the same fire histories are analyzed by
+    # many processes (e.g. reruns differing only in DCR or L); the directory can be deleted at any time
+    if os.environ.get(stage_cache_variable):
+        os.environ[stage_cache_variable] = str(Path(os.environ[stage_cache_variable]).resolve())
+
+    # the in-process modes (critical_fire_load to form) commit each grid point's result to a store of their
+    # own as it is done, so that a rerun of a timed out or preempted job resumes where it stopped; their
+    # estimates differ from the Dakota modes' (results.sqlite) and from each other's, hence one store per mode
+    store_path = Path(f"results_{fragility_mode}.sqlite").resolve()
+
+    # a study that raises is reported and left out of the results, without stopping the other studies; the
+    # failures are listed in failed_tasks.csv, and a rerun of the job retries them (the modes that store results)
+    failures = []
+
+    def record_failure(task, error):
+        failures.append({"task": task.name, "error": repr(error)})
+
+    if fragility_mode == "adaptive":
+        dakota_modes.run_adaptive_sweep(
+            source, section_size_list, eccentricities, lengths, DC_ratios, dakota_interface, record_failure
+        )
+    elif fragility_mode in ("critical_DCR", "per_DCR"):
+        dakota_modes.run_grid_sweep(
+            source,
+            section_size_list,
+            eccentricities,
+            lengths,
+            DC_ratios,
+            fire_loads,
+            fragility_mode,
+            dakota_interface,
+            record_failure,
+        )
+    else:
+        run_sweep = {
+            "critical_fire_load": in_process_modes.run_critical_fire_load_sweep,
+            "common_random_numbers": in_process_modes.run_common_random_numbers_sweep,
+            "sequential": in_process_modes.run_sequential_sweep,
+            "subset_simulation": in_process_modes.run_subset_simulation_sweep,
+            "form": in_process_modes.run_form_sweep,
+        }[fragility_mode]
+        run_sweep(source, section_size_list, eccentricities, lengths, DC_ratios, fire_loads, store_path, record_failure)
+
+    if failures:
+        pd.DataFrame(failures).to_csv("failed_tasks.csv", index=False)
 
     # Touch a finish file after completing all analyses
     Path(source.parent / "finish.txt").touch()
@@ -0,0 +1,375 @@
+# In-process modes of the fragility sweep (see fragility_analysis): no Dakota studies; the samples are drawn
+# from the source's dakota.in and analyzed in this process with the column analysis modules of its templatedir,
+# each grid point's result committed to a store of the mode's own as it is done
+import sys
+from functools import partial
+import pandas as pd
+import numpy as np
+import sweep_scheduler
+from result_store import ResultStore
+
+
+# Function to make the column analysis modules of the source's templatedir importable in this process
+def use_templatedir(source):
+    templatedir = str(source / "templatedir")
+    if templatedir not in sys.path:
+        sys.path.insert(0, templatedir)
+
+
+# Function to name a grid point's column in the result tables
+def grid_key(section_size, e, L, DCR):
+    return f"{section_size}_{e:.3f}_{L}_{DCR:.2f}"
+
+
+# Function to open the store of an in-process mode, with its contents as {key: (pf, details)}
+def open_store(store_path):
+    store = ResultStore(store_path)
+    details = store.load_details()
+    return store, {key: (pf, details.get(key, {})) for key, pf in store.load().items()}
+
+
+# Function to look up the result covering some grid points in the store, or compute it and commit it at once,
+# so that a rerun of the job (e.g. after a timeout) skips every grid point already done
+def stored_result(store, stored, points, compute):
+    # inputs: an open store and its contents (see open_store), the (section_size, e, L, DCR, fire_load)
+    #         grid points the result covers, compute() -> (pf, {name: value} details)
+    # outputs: (pf, details)
+    keys = [ResultStore.key(*point) for point in points]
+    if not all(key in stored for key in keys):
+        pf, details = compute()
+        store.put([point + (pf,) for point in points], [details] * len(points))
+        stored.update({key: (pf, details) for key in keys})
+    return stored[keys[0]]
+
+
+# Function to get the results of a task's grid points fire load by fire load, highest first, each from the
+# store or computed and committed at once (see stored_result)
+def stored_results(store_path, fire_loads, point_groups, compute, stop_at_zero=True):
+    # inputs: point_groups: lists of (section_size, e, L, DCR) grid points that share one result,
+    #         compute(fire_load, point) -> (pf, details) of a group, given its first point,
+    #         stop_at_zero: stop after the first fire load at which no group fails (the lower ones stay zero)
+    # outputs: for each fire load up to the stop, [(pf, details) of each group]
+    store, stored = open_store(store_path)
+    results = []
+    for fire_load in fire_loads:
+        results.append(
+            [
+                stored_result(
+                    store, stored, [point + (fire_load,) for point in points], partial(compute, fire_load, points[0])
+                )
+                for points in point_groups
+            ]
+        )
+        if stop_at_zero and all(pf == 0 for pf, _ in results[-1]):
+            break
+    store.close()
+    return results
+
+
+# Function to spread stored_results' results over the columns of the groups' grid points
+def result_columns(results, point_groups, fire_loads, value, fill=0):
+    # inputs: value(pf, details) -> a column's entry, fill: the entry at the fire loads after the stop
+    # outputs: {grid_key: [entry at each fire load]}
+    columns = {}
+    for i, points in enumerate(point_groups):
+        column = [value(*row[i]) for row in results] + [fill] * (len(fire_loads) - len(results))
+        for point in points:
+            columns[grid_key(*point)] = column
+    return columns
+
+
+# Function to run one study per task on a process pool sized to the node, see sweep_scheduler.run_sweep
+def run_tasks(tasks, run_task, on_failure):
+    cores = sweep_scheduler.node_cores()
+    return sweep_scheduler.run_sweep(tasks, run_task, max_workers=min(cores, len(tasks)), on_failure=on_failure)
+
+
+# Function to write each section size's tables, {section}'s tasks' parts of table {name} as {name}_{section}.csv
+def write_tables(section_size_list, tasks, task_results, fire_loads, fire_load_tables=("results", "samples")):
+    # inputs: task_results: {task.name: {name: part}}, a part being {grid_key: column} (the columns are
+    #         placed side by side) or a list of rows (the rows are appended); fire_load_tables: the tables
+    #         with one row per fire load, which get a fire_load column
+    for section_size in section_size_list:
+        tables = {}
+        for task in [task for task in tasks if task.section_size == section_size and task.name in task_results]:
+            for name, part in task_results[task.name].items():
+                if isinstance(part, dict):
+                    tables.setdefault(name, {}).update(part)
+                else:
+                    tables.setdefault(name, []).extend(part)
+        for name, table in tables.items():
+            table = pd.DataFrame(table)
+            if name in fire_load_tables:
+                table.insert(0, "fire_load", fire_loads)
+            table.to_csv(f"{name}_{section_size}.csv", index=False)
+
+
+# Function to list the tasks of a sweep, one per section size or one per (section size, DCR)
+def section_tasks(section_size_list, eccentricities, lengths, DC_ratios=(None,)):
+    return [
+        sweep_scheduler.SweepTask(section_size, eccentricities[0], lengths[0], DCR, None, 0)
+        for section_size in section_size_list
+        for DCR in DC_ratios
+    ]
+
+
+# Function to evaluate the whole grid of one section size on a single sampled design
+def run_common_random_numbers_task(task, source, eccentricities, lengths, DC_ratios, fire_loads, store_path):
+    # every grid point sees the same samples (common random numbers); the design's rooms and epsilon
+    # terms are set up once, and each fire load's temperature histories serve all its e, L and DCR
+    use_templatedir(source)
+    from dakota_sampling import DakotaSamplingStudy
+    from column_analysis import ColumnSampleDesign
+
+    study = DakotaSamplingStudy(source / "dakota.in")
+    design = ColumnSampleDesign(**study.as_dict(study.sample()), section_size=task.section_size)
+
+    def analyze(fire_load, point):
+        L, DCR = point[2:]
+        result = design.analyze(fire_load, DCR, L / 3.281)  # ft to m, as in column_config.py
+        return np.mean(result.failure_indicator), {"samples": len(result.failure_indicator)}
+
+    point_groups = [[(task.section_size, e, L, DCR)] for e in eccentricities for L in lengths for DCR in DC_ratios]
+    results = stored_results(store_path, fire_loads, point_groups, analyze)
+    return {"results": result_columns(results, point_groups, fire_loads, lambda pf, details: pf)}
+
+
+# Function to evaluate the whole grid of one section size by sequential sampling
+def run_sequential_task(task, source, eccentricities, lengths, DC_ratios, fire_loads, width, max_samples, store_path):
+    # batches of dakota.in's size are drawn with seeds seed, seed + 1, ..., the same batches at every
+    # grid point (common random numbers); each grid point uses batches until the confidence interval on
+    # its pf is narrower than width or max_samples is reached (see sequential_sampling)
+    use_templatedir(source)
+    from dakota_sampling import DakotaSamplingStudy
+    from column_analysis import ColumnSampleDesign
+    from sequential_sampling import sequential_failure_probability
+
+    study = DakotaSamplingStudy(source / "dakota.in")
+    designs = []
+
+    def batch_design(k):
+        while len(designs) <= k:
+            seed = None if study.seed is None else study.seed + len(designs)
+            designs.append(ColumnSampleDesign(**study.as_dict(study.sample(seed=seed)), section_size=task.section_size))
+        return designs[k]
+
+    def estimate(fire_load, point):
+        L, DCR = point[2:]
+        result = sequential_failure_probability(
+            lambda k: batch_design(k).analyze(fire_load, DCR, L / 3.281).failure_indicator,
+            width=width,
+            max_samples=max_samples,
+        )
+        return result.pf, {"samples": result.samples, "interval": result.interval, "converged": result.converged}
+
+    point_groups = [[(task.section_size, e, L, DCR)] for e in eccentricities for L in lengths for DCR in DC_ratios]
+    results = stored_results(store_path, fire_loads, point_groups, estimate)
+    return {
+        "results": result_columns(results, point_groups, fire_loads, lambda pf, details: pf),
+        # 0 samples reported at the fire loads after the stop
+        "samples": result_columns(results, point_groups, fire_loads, lambda pf, details: details["samples"]),
+    }
+
+
+# Function to estimate the failure probabilities of one (section size, DCR) by subset simulation
+def run_subset_simulation_task(task, source, eccentricities, lengths, fire_loads, samples_per_level, store_path):
+    # the random variables are those of the source's dakota.in; the failure probabilities do not depend
+    # on e or L (see critical_DCR), so each fire load's estimate covers every e and L
+    use_templatedir(source)
+    from dakota_sampling import DakotaSamplingStudy
+    from limit_states import CapacityRatioLimitState
+    from subset_simulation import subset_simulation
+
+    study = DakotaSamplingStudy(source / "dakota.in")
+
+    def estimate(fire_load, point):
+        limit_state = CapacityRatioLimitState(study, task.DCR, task.L / 3.281, task.section_size, fire_load, e=task.e)
+        result = subset_simulation(limit_state, limit_state.dimension, samples_per_level=samples_per_level, seed=study.seed)
+        return result.pf, {
+            "evaluations": result.evaluations,
+            "coefficient_of_variation": result.coefficient_of_variation,
+            "converged": result.converged,
+        }
+
+    point_groups = [[(task.section_size, e, L, task.DCR) for e in eccentricities for L in lengths]]
+    results = stored_results(store_path, fire_loads, point_groups, estimate)
+    return {
+        "results": result_columns(results, point_groups, fire_loads, lambda pf, details: pf),
+        # the limit state evaluations, 0 at the fire loads after the stop
+        "samples": result_columns(results, point_groups, fire_loads, lambda pf, details: details["evaluations"]),
+    }
+
+
+# Function to compute first- and second-order reliability estimates of one (section size, DCR)
+def run_form_task(task, source, eccentricities, lengths, fire_loads, store_path):
+    # the random variables are those of the source's dakota.in; besides pf, gives one reliability row per
+    # grid point and fire load with beta, pf (FORM and SORM) and the importance factor of each random
+    # variable (see form_sorm); the result does not depend on e or L, so each fire load's covers every e and L
+    use_templatedir(source)
+    from dakota_sampling import DakotaSamplingStudy
+    from limit_states import CapacityRatioLimitState
+    from form_sorm import form, sorm
+
+    study = DakotaSamplingStudy(source / "dakota.in")
+
+    def reliability(fire_load, point):
+        limit_state = CapacityRatioLimitState(study, task.DCR, task.L / 3.281, task.section_size, fire_load, e=task.e)
+        result = sorm(limit_state, form(limit_state, limit_state.dimension))
+        return result.pf_form, {
+            "beta": result.beta,
+            "pf_sorm": result.pf_sorm,
+            "iterations": result.iterations,
+            "evaluations": result.evaluations,
+            "converged": result.converged,
+            **{f"importance_{name}": value for name, value in zip(limit_state.descriptors, result.importance_factors)},
+        }
+
+    # the random variables of the limit state's standard normal space (see limit_states)
+    descriptors = CapacityRatioLimitState(study, task.DCR, task.L / 3.281, task.section_size, fire_loads[0]).descriptors
+    point_groups = [[(task.section_size, e, L, task.DCR) for e in eccentricities for L in lengths]]
+    results = stored_results(store_path, fire_loads, point_groups, reliability, stop_at_zero=False)
+
+    def row(pf_form, details):
+        return {
+            "beta": details["beta"],
+            "pf_form": pf_form,
+            **{name: details[name] for name in ["pf_sorm", "iterations", "evaluations", "converged"]},
+            **{f"importance_{name}": details[f"importance_{name}"] for name in descriptors},
+        }
+
+    return {
+        "results": result_columns(results, point_groups, fire_loads, lambda pf, details: pf),
+        "reliability": [
+            {"key": key, "fire_load": fire_load, **entry}
+            for key, column in result_columns(results, point_groups, fire_loads, row).items()
+            for fire_load, entry in zip(fire_loads, column)
+        ],
+    }
+
+
+# Function to solve every sample's critical fire load for one (section size, DCR)
+def run_critical_fire_load_task(task, source, eccentricities, lengths, fire_loads, fire_load_min, fire_load_max, store_path):
+    # critical fire loads do not depend on e or L (see critical_DCR); the pf they give at every fire load
+    # is committed to the store (for every e and L) together with the samples' critical fire loads
+    use_templatedir(source)
+    from dakota_sampling import DakotaSamplingStudy
+    from critical_fire_load import critical_fire_load, fragility_from_critical_fire_load
+
+    store, stored = open_store(store_path)
+    points = [
+        (task.section_size, e, L, task.DCR, fire_load) for fire_load in fire_loads for e in eccentricities for L in lengths
+    ]
+    if all(ResultStore.key(*point) in stored for point in points):
+        critical_fire_loads = np.array(stored[ResultStore.key(*points[0])][1]["critical_fire_loads"])
+    else:
+        study = DakotaSamplingStudy(source / "dakota.in")
+        design = study.as_dict(study.sample())
+        critical_fire_loads = critical_fire_load(
+            design,
+            task.DCR,
+            task.L / 3.281,  # ft to m, as in column_config.py
+            task.section_size,
+            e=task.e,
+            fire_load_min=fire_load_min,
+            fire_load_max=fire_load_max,
+        )
+        rows = [
+            (task.section_size, e, L, task.DCR, fire_load, pf)
+            for fire_load, pf in zip(fire_loads, fragility_from_critical_fire_load(critical_fire_loads, fire_loads))
+            for e in eccentricities
+            for L in lengths
+        ]
+        store.put(rows, [{"critical_fire_loads": critical_fire_loads}] * len(rows))
+    store.close()
+    keys = [grid_key(task.section_size, e, L, task.DCR) for e in eccentricities for L in lengths]
+    return {
+        "results": {key: fragility_from_critical_fire_load(critical_fire_loads, fire_loads) for key in keys},
+        "critical_fire_loads": {key: critical_fire_loads for key in keys},
+    }
+
+
+# Function to run the critical_fire_load sweep, one in-process batched run per (section, DCR), and write
+# results_{section}.csv and critical_fire_loads_{section}.csv (every sample's critical fire load)
+def run_critical_fire_load_sweep(
+    source, section_size_list, eccentricities, lengths, DC_ratios, fire_loads, store_path, on_failure
+):
+    tasks = section_tasks(section_size_list, eccentricities, lengths, DC_ratios)
+    run_task = partial(
+        run_critical_fire_load_task,
+        source=source,
+        eccentricities=eccentricities,
+        lengths=lengths,
+        fire_loads=fire_loads,
+        fire_load_min=100,
+        fire_load_max=max(fire_loads),
+        store_path=store_path,
+    )
+    write_tables(section_size_list, tasks, run_tasks(tasks, run_task, on_failure), fire_loads)
+
+
+# Function to run the common_random_numbers sweep, one process per section size, and write results_{section}.csv
+def run_common_random_numbers_sweep(
+    source, section_size_list, eccentricities, lengths, DC_ratios, fire_loads, store_path, on_failure
+):
+    tasks = section_tasks(section_size_list, eccentricities, lengths)
+    run_task = partial(
+        run_common_random_numbers_task,
+        source=source,
+        eccentricities=eccentricities,
+        lengths=lengths,
+        DC_ratios=DC_ratios,
+        fire_loads=fire_loads,
+        store_path=store_path,
+    )
+    write_tables(section_size_list, tasks, run_tasks(tasks, run_task, on_failure), fire_loads)
+
+
+# Function to run the sequential sweep, one process per section size, and write results_{section}.csv and
+# samples_{section}.csv (the number of samples used at each grid point)
+def run_sequential_sweep(source, section_size_list, eccentricities, lengths, DC_ratios, fire_loads, store_path, on_failure):
+    tasks = section_tasks(section_size_list, eccentricities, lengths)
+    run_task = partial(
+        run_sequential_task,
+        source=source,
+        eccentricities=eccentricities,
+        lengths=lengths,
+        DC_ratios=DC_ratios,
+        fire_loads=fire_loads,
+        width=0.1,  # target width of the 95% confidence interval on each pf
+        max_samples=960,  # sample budget of each grid point
+        store_path=store_path,
+    )
+    write_tables(section_size_list, tasks, run_tasks(tasks, run_task, on_failure), fire_loads)
+
+
+# Function to run the subset_simulation sweep, one process per (section, DCR), and write results_{section}.csv
+# and samples_{section}.csv (the column analyses used at each grid point)
+def run_subset_simulation_sweep(
+    source, section_size_list, eccentricities, lengths, DC_ratios, fire_loads, store_path, on_failure
+):
+    tasks = section_tasks(section_size_list, eccentricities, lengths, DC_ratios)
+    run_task = partial(
+        run_subset_simulation_task,
+        source=source,
+        eccentricities=eccentricities,
+        lengths=lengths,
+        fire_loads=fire_loads,
+        samples_per_level=1000,
+        store_path=store_path,
+    )
+    write_tables(section_size_list, tasks, run_tasks(tasks, run_task, on_failure), fire_loads)
+
+
+# Function to run the form sweep, one process per (section, DCR), and write results_{section}.csv and
+# reliability_{section}.csv (beta, the SORM pf and the importance factors at each grid point)
+def run_form_sweep(source, section_size_list, eccentricities, lengths, DC_ratios, fire_loads, store_path, on_failure):
+    tasks = section_tasks(section_size_list, eccentricities, lengths, DC_ratios)
+    run_task = partial(
+        run_form_task,
+        source=source,
+        eccentricities=eccentricities,
+        lengths=lengths,
+        fire_loads=fire_loads,
+        store_path=store_path,
+    )
+    write_tables(section_size_list, tasks, run_tasks(tasks, run_task, on_failure), fire_loads)
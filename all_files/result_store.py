@@ -0,0 +1,73 @@
+import json
+import sqlite3
+import numpy as np
+
+
+# Persistent store of sweep results, one row per (section size, e, L, DCR, fire load), with optional
+# details of each result (sample counts, error estimates, ...) kept as JSON by name;
+# every result is committed as soon as it arrives, so a restarted sweep can skip what is done
+class ResultStore:
+    def __init__(self, path="results.sqlite"):
+        self.path = path
+        # several worker processes may write to the same store, so wait for each other's locks
+        self.connection = sqlite3.connect(path, timeout=60)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "section_size TEXT, e REAL, L REAL, DCR REAL, fire_load REAL, pf REAL, "
+            "PRIMARY KEY (section_size, e, L, DCR, fire_load))"
+        )
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS details ("
+            "section_size TEXT, e REAL, L REAL, DCR REAL, fire_load REAL, name TEXT, value TEXT, "
+            "PRIMARY KEY (section_size, e, L, DCR, fire_load, name))"
+        )
+        self.connection.commit()
+
+    # Function to normalize a key, so that e.g. DCRs from np.arange match across runs
+    @staticmethod
+    def key(section_size, e, L, DCR, fire_load):
+        return (
+            str(section_size),
+            round(float(e), 6),
+            round(float(L), 6),
+            round(float(DCR), 6),
+            round(float(fire_load), 6),
+        )
+
+    # Function to store results, given as (section_size, e, L, DCR, fire_load, pf) rows, and optionally
+    # a {name: value} dict of details per row (numbers, booleans or arrays); both are committed together
+    def put(self, rows, details=None):
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+            [self.key(*row[:5]) + (float(row[5]),) for row in rows],
+        )
+        if details is not None:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO details VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    self.key(*row[:5]) + (name, json.dumps(np.asarray(value).tolist()))
+                    for row, row_details in zip(rows, details)
+                    for name, value in row_details.items()
+                ],
+            )
+        self.connection.commit()
+
+    # Function to read every stored result as {key: pf}
+    def load(self):
+        rows = self.connection.execute(
+            "SELECT section_size, e, L, DCR, fire_load, pf FROM results"
+        ).fetchall()
+        return {tuple(row[:5]): row[5] for row in rows}
+
+    # Function to read every stored result's details as {key: {name: value}}
+    def load_details(self):
+        details = {}
+        rows = self.connection.execute(
+            "SELECT section_size, e, L, DCR, fire_load, name, value FROM details"
+        ).fetchall()
+        for row in rows:
+            details.setdefault(tuple(row[:5]), {})[row[5]] = json.loads(row[6])
+        return details
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,160 @@
+import os
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+
+# One independent study of the fragility sweep
+class SweepTask:
+    def __init__(self, section_size, e, L, DCR, fire_load, fire_load_index):
+        self.section_size = section_size
+        self.e = e
+        self.L = L
+        self.DCR = DCR  # None when the study covers every DCR (critical_DCR mode)
+        self.fire_load = fire_load
+        self.fire_load_index = fire_load_index
+        # studies of one series differ only in fire load
+        self.series = (section_size, e, L, DCR)
+        self.name = f"{section_size}_{e:.3f}_{L}_{0 if DCR is None else DCR:.2f}_{fire_load_index}"
+
+    @property
+    def var_values_list(self):
+        # values for configure_analysis; any DCR will do when the study covers every DCR
+        DCR = 0.5 if self.DCR is None else self.DCR
+        return [DCR, self.L, self.e, self.section_size, self.fire_load]
+
+
+# Function to expand the sweep grid into independent tasks
+def expand_grid(section_size_list, eccentricities, lengths, DC_ratios, fire_loads, fragility_mode):
+    if fragility_mode == "critical_DCR":
+        # one study per (section, fire load) covers every e, L and DCR
+        series_list = [(section_size, eccentricities[0], lengths[0], None) for section_size in section_size_list]
+    else:
+        series_list = [
+            (section_size, e, L, DCR)
+            for section_size in section_size_list
+            for e in eccentricities
+            for L in lengths
+            for DCR in DC_ratios
+        ]
+    # highest fire loads first, so that a series that reaches pf = 0 can drop its remaining studies
+    return [
+        SweepTask(*series, fire_load, num)
+        for num, fire_load in enumerate(fire_loads)
+        for series in series_list
+    ]
+
+
+# Studies of the sweep that share a section and fire load, and so the sampled rooms and materials,
+# run as one study whose samples are analyzed once and checked at every grid point of the group
+class SweepGroup:
+    def __init__(self, tasks):
+        self.tasks = tasks
+        self.section_size = tasks[0].section_size
+        self.fire_load = tasks[0].fire_load
+        self.fire_load_index = tasks[0].fire_load_index
+        # groups of the same studies' series differ only in fire load (after a resumed run, a group may hold
+        # series that groups at higher fire loads do not, and is then never dropped for those groups' pf = 0)
+        self.series = tuple(task.series for task in tasks)
+        self.name = f"{self.section_size}_group_{self.fire_load_index}"
+
+    @property
+    def var_values_list(self):
+        # values for configure_analysis, those of the group's first study
+        return self.tasks[0].var_values_list
+
+    @property
+    def grid_points(self):
+        # (DCR, e, L) of the group's studies, in the order of self.tasks
+        return [(task.DCR, task.e, task.L) for task in self.tasks]
+
+
+# Function to group the tasks that share a section and fire load, highest fire loads first
+def group_tasks(tasks):
+    groups = {}
+    for task in sorted(tasks, key=lambda task: task.fire_load_index):
+        groups.setdefault((task.section_size, task.fire_load_index), []).append(task)
+    return [SweepGroup(group) for group in groups.values()]
+
+
+# Function to get the number of cores reserved for the job
+def node_cores():
+    return int(os.environ.get("SLURM_NTASKS", os.cpu_count()))
+
+
+# Function to run all tasks on a process pool
+def run_sweep(tasks, run_task, max_workers=None, is_zero=None, on_result=None, on_failure=None):
+    # run_task(task) -> result; is_zero(result) -> True when the series has reached pf = 0, in which case
+    # its studies at lower fire loads are not run; on_result(task, result) is called in this process as each
+    # task completes (e.g. to store it), on_failure(task, error) as each task raises (its traceback is printed)
+    # returns {task.name: result} for every task that ran to completion; a failed task is left out of it
+    # without stopping the other tasks
+    max_workers = node_cores() if max_workers is None else max_workers
+    results = {}
+    # tasks are submitted one at a time as workers free up, highest fire loads first, so that a series that
+    # reaches pf = 0 drops its studies at lower fire loads before they start
+    queue = sorted(tasks, key=lambda task: task.fire_load_index)
+    zero_index = {}  # fire load index at which each series reached pf = 0
+    running = {}
+    failed = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        while queue or running:
+            queue = [
+                task
+                for task in queue
+                if task.fire_load_index <= zero_index.get(task.series, task.fire_load_index)
+            ]
+            while queue and len(running) < max_workers:
+                # prefer a series with no study running, whose pf = 0 cannot drop the study before it ends
+                running_series = {task.series for task in running.values()}
+                task = next((task for task in queue if task.series not in running_series), queue[0])
+                queue.remove(task)
+                running[executor.submit(run_task, task)] = task
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as error:
+                    print(f"{task.name}: failed", flush=True)
+                    traceback.print_exception(type(error), error, error.__traceback__)
+                    failed.append(task.name)
+                    if on_failure is not None:
+                        on_failure(task, error)
+                    continue
+                results[task.name] = result
+                if on_result is not None:
+                    on_result(task, result)
+                print(f"{task.name}: done", flush=True)
+                if is_zero is not None and is_zero(result):
+                    zero_index[task.series] = min(zero_index.get(task.series, task.fire_load_index), task.fire_load_index)
+    if failed:
+        print(f"{len(failed)} of {len(tasks)} tasks failed: {', '.join(failed)}", flush=True)
+    return results
+
+
+# Function to drop tasks that a previous run already finished, given {task.name: result} of that run
+def pending_tasks(tasks, results, is_zero):
+    # a task is also done when its series reached pf = 0 at a higher fire load
+    zero_index = {}
+    for task in tasks:
+        if task.name in results and is_zero(results[task.name]):
+            zero_index[task.series] = min(zero_index.get(task.series, task.fire_load_index), task.fire_load_index)
+    return [
+        task
+        for task in tasks
+        if task.name not in results and task.fire_load_index <= zero_index.get(task.series, task.fire_load_index)
+    ]
+
+
+# Function to collect one series' results in fire load order, zero from its first pf = 0 onwards
+def series_results(tasks, results, is_zero, zero, missing):
+    # missing stands in for the results of studies that failed (before the series reached pf = 0)
+    values = []
+    for task in sorted(tasks, key=lambda task: task.fire_load_index):
+        if values and is_zero(values[-1]):
+            values.append(zero)
+        elif task.name not in results:
+            values.append(missing)
+        else:
+            values.append(results[task.name])
+    return values
@@ -0,0 +1,42 @@
+from pathlib import Path
+import runpy
+import sys
+import numpy as np
+from column_analysis import ColumnSampleDesign, grid_point_responses
+from dakota_parameters import read_parameter_blocks
+
+# driver for Dakota's batch interface ("fork batch"): Dakota writes the parameters of all evaluations of a
+# batch to one parameters file, runs the driver once, and reads all their responses from one results file,
+# one evaluation after another separated by lines beginning with "#"; the whole batch is evaluated as one
+# vectorized design (column_analysis.ColumnSampleDesign) in this process
+#   python3 -m batch_evaluation <parameters file> <results file> [<response names>]
+
+
+def evaluate_batch(parameters_file, response_names=None, directory="."):
+    # inputs: the batch's parameters file and column_config.py of a work directory, the response names
+    #         (default: those the parameters file asks for)
+    # outputs: the results file contents, the named responses of each evaluation in the parameters' order
+    blocks = read_parameter_blocks(Path(directory) / parameters_file)
+    response_names = response_names or blocks[0].responses
+    config = runpy.run_path(str(Path(directory) / "column_config.py"))
+    variables = {name: np.array([block.variables[name] for block in blocks]) for name in blocks[0].variables}
+    design = ColumnSampleDesign(**variables, section_size=config["section_size"])
+
+    def analyze(DCR, e, L):
+        return design.analyze(config["fire_load_fuel_energy_density"], DCR, L)
+
+    responses = analyze(config["DCR"], config["e"], config["L"]).responses()
+    responses.update(grid_point_responses(analyze, config.get("grid_points", ())))
+    evaluations = [
+        "".join(f"{responses[name][i]}\n" for name in response_names) for i in range(len(blocks))
+    ]
+    return "#\n".join(evaluations)
+
+
+if __name__ == "__main__":
+    # the responses named on the command line (default: those the parameters file asks for) written to
+    # the results file
+    parameters_file, results_file = sys.argv[1:3]
+    results = evaluate_batch(parameters_file, sys.argv[3:])
+    with open(results_file, "w") as f:
+        f.write(results)
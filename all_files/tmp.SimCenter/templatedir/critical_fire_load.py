@@ -0,0 +1,68 @@
+import numpy as np
+from column_analysis import ColumnSampleDesign, column_database_path
+
+# per-sample critical fire load: for fixed values of the other random variables, failure is monotone
+# in fire_load_fuel_energy_density, so the smallest fire load at which each sample fails is found by
+# bisection on the vectorized fire -> steel temperature -> capacity chain; the empirical CDF of the
+# critical fire loads is the fragility curve in fire load (see fragility_from_critical_fire_load)
+# the fire-load-independent part of the chain (see column_analysis.ColumnSampleDesign) is set up once
+# for all samples and once for the bracketed ones, each bisection step only setting their fire loads
+
+
+def critical_fire_load(
+    design,
+    DCR,
+    L,
+    section_size,
+    e=0,
+    fire_load_min=100,
+    fire_load_max=4000,
+    tolerance=1.0,
+    column_database_path=column_database_path,
+    thermal_properties=None,
+):
+    # inputs: design: {random variable: array of shape (n_samples,)} without the fire load,
+    #         e.g. dakota_sampling.DakotaSamplingStudy.as_dict(design),
+    #         DCR, L (m), section_size, e: column configuration (as in column_config.py, e is not used),
+    #         fire_load_min, fire_load_max: bracket (MJ/m^2),
+    #         tolerance: bracket width at which the bisection stops (MJ/m^2)
+    # outputs: array of shape (n_samples,), the smallest fire load (MJ/m^2) at which each sample fails,
+    #          rounded up to within tolerance; fire_load_min for samples that fail already there and
+    #          np.inf for samples that do not fail at fire_load_max
+    def sample_design(samples):
+        return ColumnSampleDesign(
+            **{name: np.asarray(values)[samples] for name, values in design.items()},
+            section_size=section_size,
+            column_database_path=column_database_path,
+            thermal_properties=thermal_properties,
+        )
+
+    def fails(sample_design, fire_load):
+        return sample_design.analyze(fire_load, DCR, L).failure_indicator == 1
+
+    n_samples = len(next(iter(design.values())))
+    all_samples = np.arange(n_samples)
+    lower = np.full(n_samples, float(fire_load_min))  # highest fire load known not to fail
+    upper = np.full(n_samples, float(fire_load_max))  # lowest fire load known to fail
+
+    critical = np.full(n_samples, np.inf)
+    all_design = sample_design(all_samples)
+    fails_at_max = fails(all_design, upper)
+    fails_at_min = fails(all_design, lower)
+    critical[fails_at_min] = fire_load_min
+    bracketed = all_samples[fails_at_max & ~fails_at_min]
+    bracketed_design = sample_design(bracketed) if bracketed.size else None
+
+    # every bracketed sample halves its bracket at each step, so all of them finish together
+    while bracketed.size and upper[bracketed[0]] - lower[bracketed[0]] > tolerance:
+        middle = (lower[bracketed] + upper[bracketed]) / 2
+        fails_at_middle = fails(bracketed_design, middle)
+        upper[bracketed[fails_at_middle]] = middle[fails_at_middle]
+        lower[bracketed[~fails_at_middle]] = middle[~fails_at_middle]
+    critical[bracketed] = upper[bracketed]
+    return critical
+
+
+def fragility_from_critical_fire_load(critical_fire_load, fire_loads):
+    # a sample fails at every fire load >= its critical fire load, so pf(fire load) is their empirical CDF
+    return np.mean(critical_fire_load[None, :] <= np.asarray(fire_loads, dtype=float)[:, None], axis=1)
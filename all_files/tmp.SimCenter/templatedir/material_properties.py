@@ -87,66 +87,114 @@ class SteelMechanicalProperties(MechanicalProperties):
         )
 
 
+def _piecewise(branches, temperature, epsilon=0):
+    # evaluates the first branch whose condition holds
+    # scalar temperature and epsilon: plain if/elif, only the matching formula is evaluated;
+    # ValueError if no condition holds (e.g. a temperature outside 20-1200 degrees Celsius, or NaN)
+    # array temperature and/or epsilon: every formula on the whole (broadcast) array, selected by mask;
+    # NaN wherever no condition holds, so that NaN-padded histories (e.g. of
+    # fire_curves.ParametricFireCurveBatch) stay NaN; callers check the range of real values themselves
+    if np.isscalar(temperature) and np.isscalar(epsilon):
+        T = temperature
+        for condition, formula in branches:
+            if condition(T):
+                return formula(T, epsilon)
+        raise ValueError(f"temperature {T} is outside the range of the property formulas")
+    T = np.asarray(temperature, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = np.select(
+            [condition(T) for condition, _ in branches],
+            [formula(T, epsilon) for _, formula in branches],
+            np.nan,
+        )
+    return value[()]
+
+
 class SteelThermalProperties(ThermalProperties):
+    # temperature and epsilon may be scalars or arrays and are broadcast against each other
+    thermal_conductivity_branches = (
+        (
+            lambda T: T <= 800,
+            lambda T, epsilon: 60 - np.exp(np.log(60 - (54 - 3.33e-2 * T)) + 145.4e-3 - 0.5e-3 * T + 0.206 * epsilon),
+        ),
+        (
+            lambda T: T > 800,
+            lambda T, epsilon: 60 - np.exp(3.23 + 0.206 * epsilon) + 0 * T,
+        ),
+    )
+    thermal_strain_branches = (
+        # applies when the steel temperature is greater than or equal to 20 degrees Celsius and less than 750 degrees Celsius
+        (
+            lambda T: (20 <= T) & (T < 750),
+            lambda T, epsilon: (
+                np.sqrt(
+                    1.2 * (10 ** (-5)) * T
+                    + 0.4 * (10 ** (-8)) * T**2
+                    - 2.416 * (10 ** (-4))
+                )
+                - 1.28e-3 + (3.96e-6) * T + 0.0039*epsilon
+            )**2,
+        ),
+        # applies when the steel temperature is greater than or equal to 750 degrees Celsius and less than or equal to 860 degrees Celsius
+        (
+            lambda T: (750 <= T) & (T <= 860),
+            lambda T, epsilon: (np.sqrt(1.1 * (10 ** (-2))) + (1.69 + 0.64*(T - 750) - 1.7*(T - 750)**0.81 + 3.7*epsilon)*(10**-3))**2,
+        ),
+        # applies when the steel temperature is greater than 860 degrees Celsius and less than or equal to 1200 degrees Celsius
+        (
+            lambda T: (860 < T) & (T <= 1200),
+            lambda T, epsilon: (np.sqrt(2 * (10 ** (-5)) * T - 6.2 * (10 ** (-3))) - 2.32e-3 + (0.173e-6) * (T - 860) + 0.0037*epsilon)**2,
+        ),
+    )
+    specific_heat_branches = (
+        # applies when the steel temperature is greater than or equal to 20 degrees Celsius and less than 600 degrees Celsius
+        (
+            lambda T: (20 <= T) & (T < 600),
+            lambda T, epsilon: (
+                425
+                + 0.773 * T
+                - 1.69 * (10 ** (-3)) * T**2
+                + 2.22 * (10 ** (-6)) * T**3
+            ),
+        ),
+        # applies when the steel temperature is greater than or equal to 600 degrees Celsius and less than 735 degrees Celsius
+        (
+            lambda T: (600 <= T) & (T < 735),
+            lambda T, epsilon: 666 + 13002 / (738 - T),
+        ),
+        # applies when the steel temperature is greater than or equal to 735 degrees Celsius and less than 900 degrees Celsius
+        (
+            lambda T: (735 <= T) & (T < 900),
+            lambda T, epsilon: 545 + 17820 / (T - 731),
+        ),
+        # applies when the steel temperature is greater than or equal to 900 degrees Celsius and less than or equal to 1200 degrees Celsius
+        (
+            lambda T: (900 <= T) & (T <= 1200),
+            lambda T, epsilon: 650.0 + 0 * T,
+        ),
+    )
+
     def __init__(self) -> None:
         super().__init__()
 
     def thermal_conductivity(self, temperature, epsilon=0):
-        T = temperature
-        if T <= 800:
-            deterministic_thermal_conductivity = 54 - 3.33e-2 * T
-            thermal_conductivity = 60 - np.exp(np.log(60 - deterministic_thermal_conductivity) + 145.4e-3 - 0.5e-3 * T + 0.206 * epsilon)
-        elif T > 800:
-            thermal_conductivity = 60 - np.exp(3.23 + 0.206 * epsilon)
-        return thermal_conductivity
+        return _piecewise(self.thermal_conductivity_branches, temperature, epsilon)
 
     def thermal_strain(self, temperature, epsilon=0):
-        T = temperature
-        if 20 <= T < 750:
-            deterministic_thermal_strain = (
-                1.2 * (10 ** (-5)) * T
-                + 0.4 * (10 ** (-8)) * T**2
-                - 2.416 * (10 ** (-4))
-            )
-            thermal_strain = (np.sqrt(deterministic_thermal_strain) - 1.28e-3 + (3.96e-6) * T + 0.0039*epsilon)**2
-            # applies when the steel temperature is greater than or equal to 20 degrees Celsius and less than 750 degrees Celsius
-        elif 750 <= T <= 860:
-            deterministic_thermal_strain = 1.1 * (10 ** (-2))
-            thermal_strain = (np.sqrt(deterministic_thermal_strain) + (1.69 + 0.64*(T - 750) - 1.7*(T - 750)**0.81 + 3.7*epsilon)*(10**-3))**2
-            # applies when the steel temperature is greater than or equal to 750 degrees Celsius and less than or equal to 860 degrees Celsius
-        elif 860 < T <= 1200:
-            deterministic_thermal_strain = 2 * (10 ** (-5)) * T - 6.2 * (10 ** (-3))
-            thermal_strain = (np.sqrt(deterministic_thermal_strain) - 2.32e-3 + (0.173e-6) * (T - 860) + 0.0037*epsilon)**2
-            # applies when the steel temperature is greater than 860 degrees Celsius and less than or equal to 1200 degrees Celsius
-        else:
+        T = np.asarray(temperature)
+        if np.any((T < 20) | (T > 1200)):
             raise ValueError
-        return thermal_strain
-
-#TODO    
+        return _piecewise(self.thermal_strain_branches, temperature, epsilon)
 
     def specific_heat(self, temperature):
         # Define the specific heat constant for the time step
-        if 20 <= temperature < 600:
-            specific_heat = (
-                425
-                + 0.773 * temperature
-                - 1.69 * (10 ** (-3)) * temperature**2
-                + 2.22 * (10 ** (-6)) * temperature**3
-            )
-            # applies when the steel temperature is greater than or equal to 20 degrees Celsius and less than 600 degrees Celsius
-        elif 600 <= temperature < 735:
-            specific_heat = 666 + 13002 / (738 - temperature)
-            # applies when the steel temperature is greater than or equal to 600 degrees Celsius and less than 735 degrees Celsius
-        elif 735 <= temperature < 900:
-            specific_heat = 545 + 17820 / (temperature - 731)
-            # applies when the steel temperature is greater than or equal to 735 degrees Celsius and less than 900 degrees Celsius
-        elif 900 <= temperature <= 1200:
-            specific_heat = 650
-            # applies when the steel temperature is greater than or equal to 900 degrees Celsius and less than or equal to 1200 degrees Celsius
-        return specific_heat
-
-    def density(self, epsilon=0):
-        return 7850
+        # values outside 20-1200 degrees Celsius raise ValueError (scalars) or give NaN (arrays)
+        return _piecewise(self.specific_heat_branches, temperature)
+
+    def density(self, temperature=20, epsilon=0):
+        if np.isscalar(temperature) and np.isscalar(epsilon):
+            return 7850
+        return np.full(np.broadcast(np.asarray(temperature), np.asarray(epsilon)).shape, 7850.0)
 
 
 class InsulationThermalProperties(ThermalProperties):
@@ -166,4 +214,101 @@ class InsulationThermalProperties(ThermalProperties):
 
     def density(self, temperature, epsilon=0):
         T = temperature
-        return np.exp(-2.028 + 7.83 * T ** (-0.0065) + 0.122 * epsilon)
\ No newline at end of file
+        return np.exp(-2.028 + 7.83 * T ** (-0.0065) + 0.122 * epsilon)
+
+class TabulatedSteelThermalProperties(SteelThermalProperties):
+    # SteelThermalProperties served from precomputed tables:
+    # specific heat on a temperature grid, thermal conductivity and thermal strain on a
+    # temperature x epsilon grid, evaluated by linear (bilinear) interpolation;
+    # temperatures or epsilons off the grid, temperatures within one grid step of a
+    # discontinuity between branches, and thermal strains within steep_steps grid steps of
+    # 20 degrees Celsius (where the square root of its first branch has an infinite slope)
+    # fall back to the analytic SteelThermalProperties
+    # with the default 1 degree Celsius / 0.05 epsilon grids, the error against the analytic
+    # formulas is below 2% for specific heat (only next to the 735 degrees Celsius peak,
+    # below 0.1% elsewhere), below 1e-3 W/mK for thermal conductivity and below 6e-6
+    # (0.03% of the largest value) for thermal strain
+    # the tables only pay off for array lookups (about 3x faster integration in
+    # SimplifiedUnprotected.get_component_temperature_batch): a scalar table lookup costs as
+    # much as the analytic scalar branch, so scalar temperature and epsilon use the analytic formulas
+    thermal_conductivity_discontinuities = (800,)
+    thermal_strain_discontinuities = (750, 860)
+    thermal_strain_steep = (20,)
+    steep_steps = 3
+
+    def __init__(self, temperature_step=1.0, epsilon_step=0.05, epsilon_limit=5.0) -> None:
+        super().__init__()
+        self.temperature_step = temperature_step
+        self.epsilon_step = epsilon_step
+        self.epsilon_limit = epsilon_limit
+        self.temperature_grid = np.arange(20, 1200 + temperature_step / 2, temperature_step)
+        self.epsilon_grid = np.arange(-epsilon_limit, epsilon_limit + epsilon_step / 2, epsilon_step)
+        analytic = SteelThermalProperties()
+        self.specific_heat_table = analytic.specific_heat(self.temperature_grid)
+        self.thermal_conductivity_table = analytic.thermal_conductivity(
+            self.temperature_grid[:, None], self.epsilon_grid[None, :]
+        )
+        self.thermal_strain_table = analytic.thermal_strain(
+            self.temperature_grid[:, None], self.epsilon_grid[None, :]
+        )
+
+    def cache_identity(self):
+        # the tables follow from the grid parameters, so stage_cache keys hash these instead of the tables
+        return (self.temperature_step, self.epsilon_step, self.epsilon_limit)
+
+    def grid_position(self, values, grid, step):
+        # index of the grid interval containing each value, fractional position inside it,
+        # and whether the value lies on the grid at all
+        position = (np.asarray(values, dtype=float) - grid[0]) / step
+        inside = (position >= 0) & (position <= grid.size - 1)
+        index = np.clip(np.floor(np.where(inside, position, 0)).astype(int), 0, grid.size - 2)
+        return index, position - index, inside
+
+    def lookup(self, table, temperature, epsilon, analytic, discontinuities, steep=()):
+        if np.isscalar(temperature) and np.isscalar(epsilon):
+            return analytic(temperature, epsilon)
+        T, epsilon = np.broadcast_arrays(np.asarray(temperature, dtype=float), np.asarray(epsilon, dtype=float))
+        i, s, inside_temperature = self.grid_position(T, self.temperature_grid, self.temperature_step)
+        j, r, inside_epsilon = self.grid_position(epsilon, self.epsilon_grid, self.epsilon_step)
+        value = (
+            (1 - s) * ((1 - r) * table[i, j] + r * table[i, j + 1])
+            + s * ((1 - r) * table[i + 1, j] + r * table[i + 1, j + 1])
+        )
+        value = np.asarray(value)
+        outside = ~(inside_temperature & inside_epsilon)
+        for discontinuity in discontinuities:
+            outside |= np.abs(T - discontinuity) <= self.temperature_step
+        for point in steep:
+            outside |= np.abs(T - point) <= self.steep_steps * self.temperature_step
+        if np.any(outside):
+            value[outside] = analytic(T[outside], epsilon[outside])
+        return value[()]
+
+    def thermal_conductivity(self, temperature, epsilon=0):
+        return self.lookup(
+            self.thermal_conductivity_table,
+            temperature,
+            epsilon,
+            super().thermal_conductivity,
+            self.thermal_conductivity_discontinuities,
+        )
+
+    def thermal_strain(self, temperature, epsilon=0):
+        return self.lookup(
+            self.thermal_strain_table,
+            temperature,
+            epsilon,
+            super().thermal_strain,
+            self.thermal_strain_discontinuities,
+            self.thermal_strain_steep,
+        )
+
+    def specific_heat(self, temperature):
+        if np.isscalar(temperature):
+            return super().specific_heat(temperature)
+        T = np.asarray(temperature, dtype=float)
+        value = np.interp(T, self.temperature_grid, self.specific_heat_table, left=np.nan, right=np.nan)
+        outside = np.isnan(value) & ~np.isnan(T)
+        if np.any(outside):
+            value[outside] = super().specific_heat(T[outside])
+        return value[()]
@@ -1,7 +1,8 @@
-# from pathlib import Path
-# import numpy as np
+from pathlib import Path
+import numpy as np
 # import matplotlib.pyplot as plt
-import pandas as pd
+# pandas is imported only when a catalog has to be built from the CSV, so that reading a
+# compiled catalog (see compile_section_catalog) does not pay its import time
 # import thermal_analyses
 
 # column_database_path = Path("/Users/emilynakamura/Downloads/NHERI/Technical/AutoSDAPlatform/ColumnDatabase.csv").resolve()
@@ -27,21 +28,48 @@ class SectionProperties:
         self.board_protection_section_factor = board_protection_section_factor
         self.ksh = ksh
 
-def get_section_properties(section_size):
-    column_dataframe = pd.read_csv("ColumnDatabase.csv")
-    # Filter the dataframe for the given section size
-    section_row = column_dataframe[column_dataframe['section size'] == section_size]
-    if section_row.empty:
-        return f"Section size {section_size} not found in the data."
-    else:
-        weight = section_row['weight'].values[0]
-        A = section_row['A'].values[0]
-        d = section_row['d'].values[0]
-        bf = section_row['bf'].values[0]
-        tw = section_row['tw'].values[0]
-        tf = section_row['tf'].values[0]
-        Ix = section_row['Ix'].values[0]
-        Iy = section_row['Iy'].values[0]
+section_catalog_fields = [
+    "weight",
+    "A",
+    "d",
+    "bf",
+    "tw",
+    "tf",
+    "Ix",
+    "Iy",
+    "F",
+    "V",
+    "Fb",
+    "Vb",
+    "contour_protection_section_factor",
+    "board_protection_section_factor",
+    "ksh",
+]
+
+
+class SectionCatalog:
+    # every section of the column database, read once, with the section factors of all
+    # rows derived in one vectorized pass
+    # inputs: the column database CSV, or a catalog compiled by compile_section_catalog (.npy)
+    # outputs: .table (structured array, one row per section, fields "section size" and
+    #          section_catalog_fields; sweeps can slice its columns directly),
+    #          .index (section size -> row of .table)
+    def __init__(self, column_database_path="ColumnDatabase.csv"):
+        if Path(column_database_path).suffix == ".npy":
+            self.table = np.load(column_database_path)
+        else:
+            self.table = self.read_column_database(column_database_path)
+        self.index = {section_size: row for row, section_size in enumerate(self.table["section size"].tolist())}
+
+    @staticmethod
+    def read_column_database(column_database_path):
+        import pandas as pd
+
+        column_dataframe = pd.read_csv(column_database_path)
+        d = column_dataframe["d"].to_numpy(dtype=float)
+        bf = column_dataframe["bf"].to_numpy(dtype=float)
+        tw = column_dataframe["tw"].to_numpy(dtype=float)
+        A = column_dataframe["A"].to_numpy(dtype=float)
         F = (2 * d + 4 * bf - 2 * tw) * 0.254
         V = A * 0.254**2
         Fb = 2 * (bf + d) * 0.254
@@ -53,25 +81,74 @@ def get_section_properties(section_size):
         * board_protection_section_factor
         / contour_protection_section_factor
         )
-        section_properties = SectionProperties(
-        section_size,
-        weight,
-        A,
-        d,
-        bf,
-        tw,
-        tf,
-        Ix,
-        Iy,
-        F,
-        V,
-        Fb,
-        Vb,
-        contour_protection_section_factor,
-        board_protection_section_factor,
-        ksh,
+        derived = {
+            "F": F,
+            "V": V,
+            "Fb": Fb,
+            "Vb": Vb,
+            "contour_protection_section_factor": contour_protection_section_factor,
+            "board_protection_section_factor": board_protection_section_factor,
+            "ksh": ksh,
+        }
+        section_sizes = column_dataframe["section size"].to_numpy(dtype=str)
+        table = np.empty(
+            len(section_sizes),
+            dtype=[("section size", section_sizes.dtype)] + [(field, float) for field in section_catalog_fields],
         )
-        return section_properties
+        table["section size"] = section_sizes
+        for field in section_catalog_fields:
+            if field in derived:
+                table[field] = derived[field]
+            else:
+                table[field] = column_dataframe[field].to_numpy(dtype=float)
+        return table
+
+    def rows(self, section_sizes):
+        # rows of .table for a list of section sizes, e.g. catalog.table[catalog.rows(sizes)]
+        return np.array([self.index[section_size] for section_size in section_sizes], dtype=int)
+
+    def get_section_properties(self, section_size):
+        if section_size not in self.index:
+            return f"Section size {section_size} not found in the data."
+        row = self.table[self.index[section_size]]
+        return SectionProperties(section_size, *(row[field] for field in section_catalog_fields))
+
+
+def compile_section_catalog(column_database_path="ColumnDatabase.csv", compiled_path=None):
+    # build step: writes the catalog (with derived section factors) as a .npy structured array,
+    # by default next to the CSV (ColumnDatabase.csv -> ColumnDatabase.npy)
+    if compiled_path is None:
+        compiled_path = Path(column_database_path).with_suffix(".npy")
+    np.save(compiled_path, SectionCatalog(column_database_path).table, allow_pickle=False)
+    return compiled_path
+
+
+# one catalog per database file, loaded on first use and shared by the whole process
+section_catalogs = {}
+
+
+def get_section_catalog(column_database_path="ColumnDatabase.csv"):
+    column_database_path = Path(column_database_path)
+    # prefer a compiled catalog next to the CSV, unless the CSV has been edited since
+    # (or is not there at all, e.g. when only the compiled catalog is staged to the node)
+    compiled_path = column_database_path.with_suffix(".npy")
+    if (
+        column_database_path.suffix != ".npy"
+        and compiled_path.is_file()
+        and (
+            not column_database_path.is_file()
+            or compiled_path.stat().st_mtime >= column_database_path.stat().st_mtime
+        )
+    ):
+        column_database_path = compiled_path
+    key = column_database_path.resolve()
+    if key not in section_catalogs:
+        section_catalogs[key] = SectionCatalog(column_database_path)
+    return section_catalogs[key]
+
+
+def get_section_properties(section_size, column_database_path="ColumnDatabase.csv"):
+    return get_section_catalog(column_database_path).get_section_properties(section_size)
     
 if __name__ == "__main__":
     # get = get_section_properties('W33X221')
@@ -87,9 +164,9 @@ if __name__ == "__main__":
 
     # column_database_path = Path("/Users/emilynakamura/Downloads/NHERI/Technical/AutoSDAPlatform/ColumnDatabase.csv").resolve()
 
-    column_dataframe = pd.read_csv("ColumnDatabase.csv")
+    section_catalog = get_section_catalog()
 
-    for section_size in column_dataframe['section size']:
+    for section_size in section_catalog.index:
         section_properties = get_section_properties(section_size)
         ksh.append(section_properties.ksh)
         weight.append(section_properties.weight)
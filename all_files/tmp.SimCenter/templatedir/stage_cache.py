@@ -0,0 +1,174 @@
+from collections import OrderedDict
+import hashlib
+import os
+from pathlib import Path
+import tempfile
+import numpy as np
+
+# memoization of the pure stages of the column analysis (fire curve -> steel temperature -> elastic
+# modulus): each stage's outputs (a tuple of arrays) are stored under a content hash of its inputs,
+# in a size-bounded in-memory LRU tier and, optionally, an on-disk tier shared by every process of a
+# sweep (one .npz file per entry, least recently used files evicted beyond max_disk_bytes);
+# the disk tier of the shared cache (get_stage_cache) is the directory named by $COLUMN_STAGE_CACHE, if set
+
+stage_cache_variable = "COLUMN_STAGE_CACHE"
+# part of every key: bump it when a stage's computation changes, so disk tiers of older runs are not reused
+stage_cache_version = 1
+# fraction of max_disk_bytes the disk tier is evicted down to once it exceeds max_disk_bytes
+disk_low_water = 0.75
+
+
+def hash_value(digest, value):
+    # feeds a stage input into a hashlib digest: arrays (and lists of numbers) by dtype, shape and bytes,
+    # scalars and strings by type and repr, containers item by item, other objects by class and either
+    # their cache_identity() (a small value standing for large derived state, e.g. precomputed tables)
+    # or their attributes
+    if isinstance(value, (list, tuple)) and all(isinstance(item, (int, float)) for item in value):
+        value = np.asarray(value, dtype=float)
+    if isinstance(value, (np.ndarray, np.generic)):
+        value = np.ascontiguousarray(value)
+        digest.update(f"array {value.dtype} {value.shape}".encode())
+        digest.update(value.tobytes())
+    elif isinstance(value, (str, bytes, int, float, bool, type(None))):
+        digest.update(f"{type(value).__name__} {value!r}".encode())
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"sequence {len(value)}".encode())
+        for item in value:
+            hash_value(digest, item)
+    elif isinstance(value, dict):
+        digest.update(f"dict {len(value)}".encode())
+        for key in sorted(value):
+            hash_value(digest, key)
+            hash_value(digest, value[key])
+    else:
+        digest.update(f"object {type(value).__module__}.{type(value).__qualname__}".encode())
+        identity = getattr(value, "cache_identity", None)
+        hash_value(digest, vars(value) if identity is None else identity())
+
+
+def stage_key(stage, *inputs):
+    # content hash (hex) of a stage's name and inputs; a key may itself be the input of a downstream stage
+    digest = hashlib.sha256(f"{stage} {stage_cache_version}".encode())
+    for value in inputs:
+        hash_value(digest, value)
+    return digest.hexdigest()
+
+
+class StageCache:
+    # inputs: max_bytes: size of the in-memory tier (bytes of the stored arrays; one tier per process, so
+    #                    the default stays small for pools of many workers),
+    #         directory: on-disk tier (None: memory only), max_disk_bytes: size of the on-disk tier
+    # outputs: .cached(key, compute) -> compute()'s tuple of arrays, computed once per key;
+    #          .hits, .misses
+    # the size of the disk tier is scanned once, then tracked from this process's writes; the directory is
+    # only rescanned (and evicted down to disk_low_water of max_disk_bytes) once that total exceeds the cap,
+    # so the disk tier costs one file write per miss rather than a directory listing
+    def __init__(self, max_bytes=32 * 2**20, directory=None, max_disk_bytes=4 * 2**30):
+        self.max_bytes = max_bytes
+        self.directory = None if directory is None else Path(directory)
+        self.max_disk_bytes = max_disk_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.disk_bytes = 0
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self.disk_bytes = sum(size for _, size, _ in self.disk_files())
+
+    def cached(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            self.misses += 1
+            value = self.put(key, compute())
+        else:
+            self.hits += 1
+        return value
+
+    def get(self, key):
+        # returns the stored tuple of arrays, or None
+        path = None if self.directory is None else self.directory / f"{key}.npz"
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            if path is not None:
+                try:
+                    os.utime(path)  # the file's mtime orders the disk tier's eviction
+                except OSError:
+                    pass
+            return self.entries[key]
+        if path is None:
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                value = tuple(data[f"arr_{i}"] for i in range(len(data.files)))
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            # missing, or evicted or half written by another process
+            return None
+        return self.remember(key, value)
+
+    def put(self, key, value):
+        value = self.remember(key, tuple(np.array(array) for array in value))  # copies, frozen by remember
+        if self.directory is not None:
+            # written to a temporary file and renamed, so that concurrent readers never see a partial entry
+            # (its .tmp suffix keeps it out of disk_files, so other processes' eviction leaves it alone)
+            handle, temporary_path = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+            with os.fdopen(handle, "wb") as file:
+                np.savez(file, *value)
+            path = self.directory / f"{key}.npz"
+            os.replace(temporary_path, path)
+            self.disk_bytes += path.stat().st_size
+            if self.disk_bytes > self.max_disk_bytes:
+                self.evict_disk()
+        return value
+
+    def remember(self, key, value):
+        # stores value in the in-memory tier (read-only, since callers share the arrays)
+        for array in value:
+            array.flags.writeable = False
+        if key not in self.entries:
+            self.entries[key] = value
+            self.bytes += sum(array.nbytes for array in value)
+        self.entries.move_to_end(key)
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes -= sum(array.nbytes for array in evicted)
+        return value
+
+    def disk_files(self):
+        # (mtime, size, path) of the files of the on-disk tier
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".npz"):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        return files
+
+    def evict_disk(self):
+        # removes the least recently used files of the on-disk tier until it is within disk_low_water of
+        # max_disk_bytes (its total, including other processes' files, is recounted here)
+        files = self.disk_files()
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= disk_low_water * self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+        self.disk_bytes = total
+
+
+# the process's stage cache, created on first use, with the on-disk tier named by $COLUMN_STAGE_CACHE
+stage_caches = {}
+
+
+def get_stage_cache():
+    directory = os.environ.get(stage_cache_variable) or None
+    if directory not in stage_caches:
+        stage_caches[directory] = StageCache(directory=directory)
+    return stage_caches[directory]
@@ -27,8 +27,13 @@ class ComponentTemperature(Protocol):
 
 
 class SimplifiedUnprotected(ComponentTemperature):
-    def __init__(self, time_interval=5.0):
+    # thermal_properties: steel thermal property provider, defaults to the analytic
+    # material_properties.SteelThermalProperties (e.g. material_properties.TabulatedSteelThermalProperties)
+    def __init__(self, time_interval=5.0, thermal_properties=None):
         self.time_interval = time_interval
+        if thermal_properties is None:
+            thermal_properties = material_properties.SteelThermalProperties()
+        self.thermal_properties = thermal_properties
         super().__init__()
 
     def get_component_temperature(
@@ -49,9 +54,9 @@ class SimplifiedUnprotected(ComponentTemperature):
         steel_temp = np.zeros_like(fire_temp)
         steel_temp[0] = fire_temp[0]
         time_diffs = np.diff(time)
+        # steel thermal properties
+        thermal_mat_prop = self.thermal_properties
         for i in range(1, len(steel_temp)):
-            # steel thermal properties
-            thermal_mat_prop = material_properties.SteelThermalProperties()
             density = thermal_mat_prop.density(steel_temp[i - 1])
             specific_heat = thermal_mat_prop.specific_heat(steel_temp[i - 1])
             # unprotected steel temperature calculations
@@ -74,6 +79,60 @@ class SimplifiedUnprotected(ComponentTemperature):
             steel_temp[i] = steel_temp[i - 1] + delta_T
         return steel_temp
 
+    def get_component_temperature_batch(
+        self,
+        time,
+        fire_temp,
+        convective_heat_transfer_coefficient,
+        material_emissivity,
+        fire_emissivity=1.0,
+        contour_protection_section_factor=210,
+        board_protection_section_factor=153,
+        SB_coefficient=56.7e-12,
+    ):
+        # batched get_component_temperature: marches over time only, vectorized across samples
+        # inputs: time (seconds), shape (n_steps,), common to all samples,
+        #         fire_temp, shape (n_samples, n_steps), NaN-padded rows allowed
+        #         (e.g. fire_curves.ParametricFireCurveBatch.fire_temp()),
+        #         convective_heat_transfer_coefficient, material_emissivity, fire_emissivity,
+        #         section factors: scalars or arrays of shape (n_samples,)
+        # outputs: steel_temp, shape (n_samples, n_steps), NaN wherever fire_temp is NaN
+        fire_temp = np.atleast_2d(np.asarray(fire_temp, dtype=float))
+        contour_protection_section_factor = np.asarray(contour_protection_section_factor, dtype=float)
+        correction_factor_for_shadow_effect = (
+            0.9 * contour_protection_section_factor / np.asarray(board_protection_section_factor, dtype=float)
+        )
+        resultant_emissivity = np.asarray(fire_emissivity, dtype=float) * np.asarray(material_emissivity, dtype=float)
+        convective_heat_transfer_coefficient = np.asarray(convective_heat_transfer_coefficient, dtype=float)
+        time_diffs = np.diff(time)
+        if np.any(time_diffs > self.time_interval):
+            raise ValueError("Error. Time step is greater than 5 seconds. Time array is not properly spaced for unprotected case.")
+        # per-sample constants of the update, shape (n_samples,)
+        exposure = correction_factor_for_shadow_effect * contour_protection_section_factor * np.ones(fire_temp.shape[0])
+        radiation = SB_coefficient * resultant_emissivity * np.ones(fire_temp.shape[0])
+        convection = convective_heat_transfer_coefficient * np.ones(fire_temp.shape[0])
+        steel_temp = np.empty_like(fire_temp)
+        if fire_temp.shape[1] == 0:
+            return steel_temp
+        steel_temp[:, 0] = fire_temp[:, 0]
+        # steel thermal properties
+        thermal_mat_prop = self.thermal_properties
+        for i in range(1, fire_temp.shape[1]):
+            previous = steel_temp[:, i - 1]
+            density = thermal_mat_prop.density(previous)
+            specific_heat = thermal_mat_prop.specific_heat(previous)
+            delta_T = (
+                time_diffs[i - 1]
+                * exposure
+                / (density * specific_heat)
+                * (
+                    convection * (fire_temp[:, i] - previous)
+                    + radiation * (fire_temp[:, i] ** 4 - previous**4)
+                )
+            )
+            steel_temp[:, i] = previous + delta_T
+        return steel_temp
+
 
 class SimplifiedProtected(ComponentTemperature):
     def __init__(self, time_interval=30.0):
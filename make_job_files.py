@@ -1,7 +1,11 @@
 from pathlib import Path
 import shutil
+import sys
 import pandas as pd
 
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+from parse_section_factor import compile_section_catalog
+
 
 def make_column_section_size_grouped_list(group_size=10):
     section_file_name = Path(__file__).parent / "ColumnDatabase.csv"
@@ -28,6 +32,9 @@ if __name__ == "__main__":
         if not destination.is_dir():
             shutil.copytree(files_dir, destination)
 
+        # precompiled section catalog, so that column_analysis.py does not parse the CSV (or import pandas) per sample
+        compile_section_catalog(destination / "tmp.SimCenter" / "templatedir" / "ColumnDatabase.csv")
+
         job_script = destination / "job_script.sh"
         with open(job_script, "r") as file:
             job_script_content = file.readlines()
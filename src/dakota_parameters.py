@@ -0,0 +1,78 @@
+import re
+
+# reader of Dakota parameters files, in either of Dakota's two formats:
+#   standard: one "<value> <tag>" per line, e.g. "8 variables", "5.1e+00 room_length1", "1 ASV_1:critical_DCR"
+#   aprepro:  one "{ <tag> = <value> }" per line, e.g. "{ DAKOTA_VARS = 8 }", "{ room_length1 = 5.1e+00 }"
+# the parameters file of a batch interface holds the blocks of all evaluations of the batch, one after another
+
+aprepro_pattern = re.compile(r"\{\s*(\S+)\s*=\s*(.*?)\s*\}$")
+variables_tags = ("variables", "DAKOTA_VARS")
+eval_id_tags = ("eval_id", "DAKOTA_EVAL_ID")
+
+
+class ParameterBlock:
+    # the parameters of one evaluation
+    # variables: {descriptor: value} in the file's order (float, or str for string variables)
+    # eval_id: Dakota's evaluation id (str, e.g. "12", or "3:12" for the 12th evaluation of batch 3)
+    # metadata: the other entries, {tag: str} (function count, ASV_i:..., DVV_i:..., analysis components, ...)
+    # responses: names of the responses Dakota asks for (from the ASV_i:<name> entries), in order
+    def __init__(self):
+        self.variables = {}
+        self.eval_id = None
+        self.metadata = {}
+
+    @property
+    def responses(self):
+        return [tag.split(":", 1)[1] for tag in self.metadata if tag.startswith("ASV_") and ":" in tag]
+
+
+def parse_value(value):
+    try:
+        return float(value)
+    except ValueError:
+        return value.strip("\"'")
+
+
+def read_parameter_entries(filename):
+    # (tag, value) pairs of the lines of a parameters file, in either format
+    entries = []
+    with open(filename, "r") as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            match = aprepro_pattern.match(line)
+            if match:
+                entries.append(match.groups())
+            else:
+                value, tag = line.split(maxsplit=1)
+                entries.append((tag.strip(), value))
+    return entries
+
+
+def read_parameter_blocks(filename):
+    # returns a list of ParameterBlock, one per evaluation in the file (one, unless it is a batch's)
+    blocks = []
+    remaining_variables = 0
+    for tag, value in read_parameter_entries(filename):
+        if remaining_variables > 0:
+            blocks[-1].variables[tag] = parse_value(value)
+            remaining_variables -= 1
+        elif tag in variables_tags:
+            blocks.append(ParameterBlock())
+            remaining_variables = int(value)
+        elif not blocks:
+            raise ValueError(f"{filename} does not start with a variables count.")
+        elif tag in eval_id_tags:
+            blocks[-1].eval_id = value
+        else:
+            blocks[-1].metadata[tag] = value
+    return blocks
+
+
+def read_parameters(filename):
+    # returns the ParameterBlock of a single evaluation's parameters file
+    blocks = read_parameter_blocks(filename)
+    if len(blocks) != 1:
+        raise ValueError(f"{filename} holds {len(blocks)} evaluations, not one.")
+    return blocks[0]
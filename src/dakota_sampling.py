@@ -0,0 +1,120 @@
+import shlex
+import numpy as np
+from scipy import stats
+
+# in-process replacement for Dakota's sampling method: reads the method and variables blocks of a
+# dakota.in file and draws the same kind of seeded Latin hypercube design as an array
+# (the design follows the same distributions and stratification as Dakota's, not Dakota's own
+# random number stream, so individual samples differ from dakotaTab.out)
+
+dakota_blocks = ["environment", "method", "model", "variables", "interface", "responses"]
+
+
+def read_dakota_input(dakota_input_path="dakota.in"):
+    # returns {block keyword: list of tokens} for the top-level blocks of a Dakota input file
+    with open(dakota_input_path, "r") as file:
+        lines = [line.split("#")[0] for line in file.readlines()]
+    tokens = shlex.split(" ".join(lines).replace("=", " ").replace(",", " "))
+    blocks = {}
+    block = None
+    for token in tokens:
+        if token in dakota_blocks:
+            block = token
+            blocks[block] = []
+        elif block is not None:
+            blocks[block].append(token)
+    return blocks
+
+
+def read_keyword_values(tokens, keyword, count, cast=float):
+    # values following a keyword (Dakota accepts singular keywords, e.g. upper_bound)
+    for i, token in enumerate(tokens):
+        if token == keyword or token == keyword.rstrip("s"):
+            return [cast(value) for value in tokens[i + 1 : i + 1 + count]]
+    raise ValueError(f"Keyword {keyword} not found in the variables block.")
+
+
+class UncertainVariable:
+    # one uncertain variable of a Dakota variables block
+    # distribution: "normal" (mean, std_deviation), "lognormal" (mean, std_deviation of the
+    #               variable itself, as in Dakota) or "uniform" (lower_bound, upper_bound)
+    def __init__(self, descriptor, distribution, parameters):
+        self.descriptor = descriptor
+        self.distribution = distribution
+        self.parameters = parameters
+        if distribution == "normal":
+            mean, std_deviation = parameters
+            self.random_variable = stats.norm(loc=mean, scale=std_deviation)
+        elif distribution == "lognormal":
+            mean, std_deviation = parameters
+            zeta = np.sqrt(np.log(1 + (std_deviation / mean) ** 2))
+            lam = np.log(mean) - zeta**2 / 2
+            self.random_variable = stats.lognorm(s=zeta, scale=np.exp(lam))
+        elif distribution == "uniform":
+            lower_bound, upper_bound = parameters
+            self.random_variable = stats.uniform(loc=lower_bound, scale=upper_bound - lower_bound)
+        else:
+            raise ValueError(f"Distribution {distribution} is not supported.")
+
+    def ppf(self, probability):
+        return self.random_variable.ppf(probability)
+
+
+class DakotaSamplingStudy:
+    # inputs: path of a dakota.in with a sampling method and normal/lognormal/uniform uncertain variables
+    # outputs: .variables (UncertainVariable, in Dakota's order), .descriptors,
+    #          .sample_type, .samples, .seed (as in the method block),
+    #          .sample() -> design, shape (samples, number of variables), columns in .descriptors order,
+    #          .as_dict(design) -> {descriptor: column}, e.g. column_analysis.analyze_column_batch(**as_dict(design), ...)
+    #          .from_standard_normal(u) -> design for points of the standard normal space
+    def __init__(self, dakota_input_path="dakota.in"):
+        blocks = read_dakota_input(dakota_input_path)
+        method = blocks["method"]
+        self.sample_type = method[method.index("sample_type") + 1] if "sample_type" in method else "lhs"
+        self.samples = int(method[method.index("samples") + 1])
+        self.seed = int(method[method.index("seed") + 1]) if "seed" in method else None
+
+        variables = blocks["variables"]
+        specifications = {
+            "normal_uncertain": ("normal", ["means", "std_deviations"]),
+            "lognormal_uncertain": ("lognormal", ["means", "std_deviations"]),
+            "uniform_uncertain": ("uniform", ["lower_bounds", "upper_bounds"]),
+        }
+        # split the variables block into one token list per uncertain variable specification
+        starts = [i for i, token in enumerate(variables) if token.endswith("_uncertain")] + [len(variables)]
+        self.variables = []
+        for start, end in zip(starts[:-1], starts[1:]):
+            specification = variables[start]
+            if specification not in specifications:
+                raise ValueError(f"Variable specification {specification} is not supported.")
+            distribution, keywords = specifications[specification]
+            tokens = variables[start:end]
+            count = int(tokens[1])
+            parameters = zip(*(read_keyword_values(tokens, keyword, count) for keyword in keywords))
+            descriptors = read_keyword_values(tokens, "descriptors", count, cast=str)
+            for descriptor, parameter in zip(descriptors, parameters):
+                self.variables.append(UncertainVariable(descriptor, distribution, parameter))
+        self.descriptors = [variable.descriptor for variable in self.variables]
+
+    def sample(self, samples=None, seed=None):
+        # Latin hypercube: one random point in each of `samples` equal-probability strata per
+        # variable, strata randomly paired across variables ("random" sample_type: plain Monte Carlo)
+        samples = self.samples if samples is None else samples
+        rng = np.random.default_rng(self.seed if seed is None else seed)
+        design = np.empty((samples, len(self.variables)))
+        for j, variable in enumerate(self.variables):
+            if self.sample_type == "lhs":
+                probability = (rng.permutation(samples) + rng.random(samples)) / samples
+            else:
+                probability = rng.random(samples)
+            design[:, j] = variable.ppf(probability)
+        return design
+
+    def from_standard_normal(self, u):
+        # design for points u, shape (n, number of variables), of the independent standard normal space
+        # used by reliability methods (e.g. subset_simulation), columns in .descriptors order
+        u = np.atleast_2d(u)
+        return np.column_stack([variable.ppf(stats.norm.cdf(u[:, j])) for j, variable in enumerate(self.variables)])
+
+    def as_dict(self, design):
+        return {descriptor: design[:, j] for j, descriptor in enumerate(self.descriptors)}
@@ -1,10 +1,13 @@
+from pathlib import Path
+import runpy
+import sys
 import numpy as np
-from params import *
-from column_config import *
 import fire_curves
 import material_properties
 import thermal_analyses
 from parse_section_factor import get_section_properties
+from dakota_parameters import read_parameters
+from stage_cache import get_stage_cache, stage_key
 
 # TODO  implement the real column demand based on the database.
 # load = E * (A * dead_load + B * live_load)
@@ -21,17 +24,6 @@ material_emissivity = 0.7
 # density = steel_room_temperature_density  # kg/m^3
 # specific_heat = room_temperature_specific_heat  # J/kg K
 
-section_properties = get_section_properties(section_size)
-A = section_properties.A / (12 * 3.281) ** 2
-I = section_properties.Ix / (12 * 3.281) ** 4
-contour_protection_section_factor = section_properties.contour_protection_section_factor
-board_protection_section_factor = section_properties.board_protection_section_factor
-
-# A = 130 / ((12*3.281)**2)  # cross-sectional area in m^2
-# I = 1150 / ((12*3.281)**4)  # m^4, using W14X342 column
-
-# L, DCR, e become our
-
 # parametric fire parameters:
 occupancy = "office"
 concrete_thermal_conductivity = 1.6
@@ -39,76 +31,420 @@ concrete_density = 2300
 concrete_specific_heat = 980
 window_base = 3  # m
 window_height = 2  # m
-# dims = room_geometry.RoomDimension(room_length1, room_length2, room_height)
-# room_length1 = dims.length1()
-# room_length2 = dims.length2()
-# room_height = dims.height()
 
-# fire temperature:
-# time = np.arange(0, 180 * 60, 5)
+column_database_path = Path(__file__).parent / "ColumnDatabase.csv"
+
+# random variables of dakota.in that the analyses accept but do not use yet (placeholders): the unprotected
+# thermal analysis has no protection, and uses the steel thermal properties without their epsilon terms;
+# e (eccentricity) is accepted alongside them, the demand does not include the eccentric moment yet
+placeholder_variables = (
+    "epsilon_protection_specific_heat",
+    "epsilon_steel_thermal_strain",
+    "epsilon_steel_thermal_conductivity",
+)
+
+
+class ColumnAnalysisResult:
+    # failure_indicator: 1 if the column fails during the fire, 0 otherwise
+    # critical_DCR: min(capacity) / capacity[0], the column fails for every DCR >= critical_DCR
+    #               (for any L, since demand = DCR * capacity[0])
+    # critical_time (seconds), critical_temperature (degrees Celsius): when the capacity is lowest
+    # diagnostics: time (seconds), fire_temperature, steel_temperature (degrees Celsius),
+    #              effective_elastic_modulus (MPa), capacity, demand (MN);
+    #              the histories (time to effective_elastic_modulus) are read-only views shared with the
+    #              stage cache (see stage_cache), copy them to modify them
+    def __init__(self, failure_indicator, time, fire_temperature, steel_temperature, effective_elastic_modulus, capacity, demand):
+        self.failure_indicator = failure_indicator
+        self.time = time
+        self.fire_temperature = fire_temperature
+        self.steel_temperature = steel_temperature
+        self.effective_elastic_modulus = effective_elastic_modulus
+        self.capacity = capacity
+        self.demand = demand
+        critical_index = np.argmin(capacity)
+        self.critical_DCR = capacity[critical_index] / capacity[0]
+        self.critical_time = time[critical_index]
+        self.critical_temperature = steel_temperature[critical_index]
 
-fire_curve = fire_curves.ParametricFireCurve(
+    def responses(self):
+        # response name (as listed in dakota.in) -> value
+        return {
+            "failure_indicator": self.failure_indicator,
+            "out": self.failure_indicator,
+            "critical_DCR": self.critical_DCR,
+            "critical_time": self.critical_time,
+            "critical_temperature": self.critical_temperature,
+        }
+
+
+def analyze_column(
+    room_length1,
+    room_length2,
+    room_height,
     zeta,
-    occupancy,
-    concrete_thermal_conductivity,
-    concrete_density,
-    concrete_specific_heat,
-    window_base,
-    window_height,
+    epsilon_steel_modulus,
+    DCR,
+    L,
+    section_size,
+    fire_load_fuel_energy_density,
+    e=0,
+    epsilon_protection_specific_heat=0,
+    epsilon_steel_thermal_strain=0,
+    epsilon_steel_thermal_conductivity=0,
+    column_database_path=column_database_path,
+):
+    # inputs: random variables (as in params.py) and column configuration (as in column_config.py, L in m);
+    #         e and the placeholder_variables are accepted but not used
+    # outputs: ColumnAnalysisResult
+    section_properties = get_section_properties(section_size, column_database_path)
+    I = section_properties.Ix / (12 * 3.281) ** 4
+    contour_protection_section_factor = section_properties.contour_protection_section_factor
+    board_protection_section_factor = section_properties.board_protection_section_factor
+
+    # A = 130 / ((12*3.281)**2)  # cross-sectional area in m^2
+    # I = 1150 / ((12*3.281)**4)  # m^4, using W14X342 column
+
+    # the fire, thermal and modulus stages are memoized on their inputs (see stage_cache), each stage's key
+    # chaining the key of the stage it reads from; the cached arrays are read-only, and so are the histories
+    # of the result, which shares them
+    cache = get_stage_cache()
+
+    # fire temperature:
+    fire_curve_inputs = (
+        zeta,
+        occupancy,
+        concrete_thermal_conductivity,
+        concrete_density,
+        concrete_specific_heat,
+        window_base,
+        window_height,
+        room_length1,
+        room_length2,
+        room_height,
+        fire_load_fuel_energy_density,
+    )
+
+    def fire_stage():
+        fire_curve = fire_curves.ParametricFireCurve(*fire_curve_inputs)
+        return fire_curve.time_array_seconds, fire_curve.fire_temp()
+
+    fire_key = stage_key("fire curve", *fire_curve_inputs)
+    time, fire_temperature = cache.cached(fire_key, fire_stage)
+
+    # steel temperature:
+    # unprotected case
+    # inputs: time (seconds), fire_temperature, convective_heat_transfer_coefficient, material_emissivity, fire_emissivity, contour_protection_section_factor=210, board_protection_section_factor=153, SB_coefficient=56.7 * 10 ** (-12),
+    thermal_analysis = thermal_analyses.SimplifiedUnprotected()
+
+    def thermal_stage():
+        steel_temperature = thermal_analysis.get_component_temperature(
+            time,  # in seconds
+            fire_temperature,
+            convective_heat_transfer_coefficient,
+            material_emissivity,
+            fire_emissivity=1.0,
+            contour_protection_section_factor=contour_protection_section_factor,
+            board_protection_section_factor=board_protection_section_factor,
+            SB_coefficient=56.7e-12,
+        )
+        return (steel_temperature,)
+
+    thermal_key = stage_key(
+        "steel temperature",
+        fire_key,
+        thermal_analysis,
+        convective_heat_transfer_coefficient,
+        material_emissivity,
+        contour_protection_section_factor,
+        board_protection_section_factor,
+    )
+    (steel_temperature,) = cache.cached(thermal_key, thermal_stage)
+
+    # reduction factor for elastic modulus:
+    mech_mat_prop = material_properties.SteelMechanicalProperties(
+        steel_room_temp_modulus=room_temperature_modulus
+    )
+    modulus_key = stage_key("elastic modulus", thermal_key, mech_mat_prop, epsilon_steel_modulus)
+    (effective_elastic_modulus,) = cache.cached(
+        modulus_key, lambda: (mech_mat_prop.elastic_modulus(steel_temperature, epsilon_steel_modulus),)
+    )
+
+    # failure evaluation:
+    capacity = np.pi**2 * effective_elastic_modulus * I / L**2  # MN
+    demand = (
+        DCR * capacity[0]
+    )  # * L / (np.sqrt(L**2 - (e * L) ** 2))  # + max(internal_force)
+    if min(capacity) > demand:
+        out = 0
+    else:
+        out = 1
+    return ColumnAnalysisResult(
+        out,
+        time,
+        fire_temperature,
+        steel_temperature,
+        effective_elastic_modulus,
+        capacity,
+        demand,
+    )
+
+
+class ColumnAnalysisBatchResult:
+    # ColumnAnalysisResult for many samples: per-sample values are arrays of shape (n_samples,),
+    # histories have shape (n_samples, len(time)) on the common time axis, NaN past each sample's fire;
+    # the histories are read-only, shared with other results of the same design and fire load;
+    # samples whose histories are all NaN (non-physical inputs) get NaN critical values
+    def __init__(self, failure_indicator, time, fire_temperature, steel_temperature, effective_elastic_modulus, capacity, demand):
+        self.failure_indicator = failure_indicator
+        self.time = time
+        self.fire_temperature = fire_temperature
+        self.steel_temperature = steel_temperature
+        self.effective_elastic_modulus = effective_elastic_modulus
+        self.capacity = capacity
+        self.demand = demand
+        critical_index = np.argmin(np.where(np.isnan(capacity), np.inf, capacity), axis=1)
+        rows = np.arange(capacity.shape[0])
+        self.critical_DCR = capacity[rows, critical_index] / capacity[:, 0]
+        self.critical_time = time[critical_index]
+        self.critical_temperature = steel_temperature[rows, critical_index]
+
+    def responses(self):
+        # response name (as listed in dakota.in) -> values, shape (n_samples,)
+        return {
+            "failure_indicator": self.failure_indicator,
+            "out": self.failure_indicator,
+            "critical_DCR": self.critical_DCR,
+            "critical_time": self.critical_time,
+            "critical_temperature": self.critical_temperature,
+        }
+
+
+class ColumnSampleDesign:
+    # one sampled design of the random variables for one section size, evaluated at many grid points
+    # (common random numbers): the section properties, the sampled rooms' fire curve geometry
+    # (opening factor, gamma), the steel modulus epsilon terms and the thermal analysis are set up once;
+    # the histories of the last fire load are kept, so other DCRs and lengths at that fire load only
+    # redo the capacity check (and the histories of earlier fire loads are memoized, see stage_cache)
+    # inputs: random variables (arrays of shape (n_samples,), e.g. the columns of
+    #         dakota_sampling.DakotaSamplingStudy.sample()) and section_size, as for analyze_column_batch;
+    #         the placeholder_variables are accepted but not used
+    # outputs: .analyze(fire_load_fuel_energy_density, DCR, L) -> ColumnAnalysisBatchResult
+    def __init__(
+        self,
+        room_length1,
+        room_length2,
+        room_height,
+        zeta,
+        epsilon_steel_modulus,
+        section_size,
+        epsilon_protection_specific_heat=0,
+        epsilon_steel_thermal_strain=0,
+        epsilon_steel_thermal_conductivity=0,
+        column_database_path=column_database_path,
+        thermal_properties=None,
+    ):
+        section_properties = get_section_properties(section_size, column_database_path)
+        self.I = section_properties.Ix / (12 * 3.281) ** 4
+        self.contour_protection_section_factor = section_properties.contour_protection_section_factor
+        self.board_protection_section_factor = section_properties.board_protection_section_factor
+
+        # fire curve of the sampled rooms, its fire load is set per grid point in analyze
+        self.fire_curve = fire_curves.ParametricFireCurveBatch(
+            zeta,
+            occupancy,
+            concrete_thermal_conductivity,
+            concrete_density,
+            concrete_specific_heat,
+            window_base,
+            window_height,
+            room_length1,
+            room_length2,
+            room_height,
+            0,
+        )
+        self.thermal_analysis = thermal_analyses.SimplifiedUnprotected(thermal_properties=thermal_properties)
+        self.mech_mat_prop = material_properties.SteelMechanicalProperties(
+            steel_room_temp_modulus=room_temperature_modulus
+        )
+        self.epsilon_steel_modulus = np.asarray(epsilon_steel_modulus, dtype=float).reshape(-1, 1)
+        self.fire_load_key = None
+
+        # stage cache keys of everything but the fire load (see stage_cache), hashed once per design
+        self.cache = get_stage_cache()
+        self.fire_curve_key = stage_key(
+            "fire curve batch",
+            *(np.asarray(value, dtype=float) for value in (zeta, room_length1, room_length2, room_height)),
+            occupancy,
+            concrete_thermal_conductivity,
+            concrete_density,
+            concrete_specific_heat,
+            window_base,
+            window_height,
+        )
+        self.thermal_key = stage_key(
+            "steel temperature batch",
+            self.thermal_analysis,
+            convective_heat_transfer_coefficient,
+            material_emissivity,
+            self.contour_protection_section_factor,
+            self.board_protection_section_factor,
+        )
+        self.modulus_key = stage_key("elastic modulus batch", self.mech_mat_prop, self.epsilon_steel_modulus)
+
+    def analyze(self, fire_load_fuel_energy_density, DCR, L):
+        # fire load, DCR and L (m) may be scalars or arrays of shape (n_samples,)
+        fire_load_key = np.asarray(fire_load_fuel_energy_density, dtype=float).tobytes()
+        if fire_load_key != self.fire_load_key:
+            # fire temperature:
+            def fire_stage():
+                self.fire_curve.set_fire_load(fire_load_fuel_energy_density)
+                return self.fire_curve.time_array_seconds, self.fire_curve.fire_temp()
+
+            fire_key = stage_key(
+                "fire curve batch", self.fire_curve_key, np.asarray(fire_load_fuel_energy_density, dtype=float)
+            )
+            time, fire_temperature = self.cache.cached(fire_key, fire_stage)
+
+            # steel temperature:
+            def thermal_stage():
+                steel_temperature = self.thermal_analysis.get_component_temperature_batch(
+                    time,  # in seconds
+                    fire_temperature,
+                    convective_heat_transfer_coefficient,
+                    material_emissivity,
+                    fire_emissivity=1.0,
+                    contour_protection_section_factor=self.contour_protection_section_factor,
+                    board_protection_section_factor=self.board_protection_section_factor,
+                    SB_coefficient=56.7e-12,
+                )
+                return (steel_temperature,)
+
+            thermal_key = stage_key("steel temperature batch", fire_key, self.thermal_key)
+            (steel_temperature,) = self.cache.cached(thermal_key, thermal_stage)
+
+            # reduction factor for elastic modulus:
+            (effective_elastic_modulus,) = self.cache.cached(
+                stage_key("elastic modulus batch", thermal_key, self.modulus_key),
+                lambda: (self.mech_mat_prop.elastic_modulus(steel_temperature, self.epsilon_steel_modulus),),
+            )
+            # the (read-only) cached arrays, shared by the results at this fire load
+            self.histories = (time, fire_temperature, steel_temperature, effective_elastic_modulus)
+            self.fire_load_key = fire_load_key
+        time, fire_temperature, steel_temperature, effective_elastic_modulus = self.histories
+
+        # failure evaluation:
+        capacity = np.pi**2 * effective_elastic_modulus * self.I / np.asarray(L, dtype=float).reshape(-1, 1) ** 2  # MN
+        demand = DCR * capacity[:, 0]
+        out = np.where(np.fmin.reduce(capacity, axis=1) > demand, 0, 1)  # 1 for all-NaN rows (NaN critical_DCR)
+        return ColumnAnalysisBatchResult(
+            out,
+            time,
+            fire_temperature,
+            steel_temperature,
+            effective_elastic_modulus,
+            capacity,
+            demand,
+        )
+
+
+def analyze_column_batch(
     room_length1,
     room_length2,
     room_height,
+    zeta,
+    epsilon_steel_modulus,
+    DCR,
+    L,
+    section_size,
     fire_load_fuel_energy_density,
-)
-fire_temperature = fire_curve.fire_temp()
-time = fire_curve.time_array_seconds
-
-# fire_curve = fire_curves.ISO834FireCurve()
-# fire_temperature = fire_curve.get_temperature()
-# time = fire_curve.time
-
-
-# print(f"{max(fire_temperature) = }")
-# print(f"{max(time) = }")
-
-
-# steel temperature:
-# protected case
-# inputs: time (seconds), fire_temperature, contour_protection_section_factor=210
-# thermal_analysis = thermal_analyses.SimplifiedUnprotected()
-# steel_temperature = thermal_analysis.get_component_temperature(
-#        time*3600,      # in seconds
-#        fire_temperature,
-#        contour_protection_section_factor=210,
-#        )
-# print(f"{max(steel_temperature) = }")
-
-# unprotected case
-# inputs: time (seconds), fire_temperature, convective_heat_transfer_coefficient, material_emissivity, fire_emissivity, contour_protection_section_factor=210, board_protection_section_factor=153, SB_coefficient=56.7 * 10 ** (-12),
-thermal_analysis = thermal_analyses.SimplifiedUnprotected()
-steel_temperature = thermal_analysis.get_component_temperature(
-    time,  # in seconds
-    fire_temperature,
-    convective_heat_transfer_coefficient,
-    material_emissivity,
-    fire_emissivity=1.0,
-    contour_protection_section_factor=contour_protection_section_factor,
-    board_protection_section_factor=board_protection_section_factor,
-    SB_coefficient=56.7e-12,
-)
-# print(f"{max(steel_temperature) = }")
+    e=0,
+    epsilon_protection_specific_heat=0,
+    epsilon_steel_thermal_strain=0,
+    epsilon_steel_thermal_conductivity=0,
+    column_database_path=column_database_path,
+    thermal_properties=None,
+):
+    # vectorized analyze_column: random variables (and DCR, L, fire load) may be arrays of
+    # shape (n_samples,), e.g. the columns of dakota_sampling.DakotaSamplingStudy.sample();
+    # e and the placeholder_variables are accepted but not used
+    # outputs: ColumnAnalysisBatchResult
+    design = ColumnSampleDesign(
+        room_length1,
+        room_length2,
+        room_height,
+        zeta,
+        epsilon_steel_modulus,
+        section_size,
+        epsilon_protection_specific_heat,
+        epsilon_steel_thermal_strain,
+        epsilon_steel_thermal_conductivity,
+        column_database_path=column_database_path,
+        thermal_properties=thermal_properties,
+    )
+    return design.analyze(fire_load_fuel_energy_density, DCR, L)
 
 
-# reduction factor for elastic modulus:
-mech_mat_prop = material_properties.SteelMechanicalProperties(
-    steel_room_temp_modulus=room_temperature_modulus
-)
-effective_elastic_modulus = mech_mat_prop.elastic_modulus(
-    steel_temperature, epsilon_steel_modulus
-)
-# print(f"{min(effective_elastic_modulus) = }")
+def grid_point_responses(analyze, grid_points):
+    # failure_indicator_<i> responses (1-based) of grid points (DCR, e, L in m) that share one sample's
+    # histories, e.g. column_config.py's grid_points for a group of studies at one fire load;
+    # analyze(DCR, e, L) -> result of one grid point (whose fire and thermal stages are reused)
+    return {
+        f"failure_indicator_{i}": analyze(DCR, e, L).failure_indicator
+        for i, (DCR, e, L) in enumerate(grid_points, start=1)
+    }
+
+
+def evaluate_work_directory(response_names=None, directory=".", parameters_file=None):
+    # file-based workflow: inputs from params.py (written per sample) and column_config.py of a work
+    # directory, read with runpy rather than imported, so that one long-lived process (see
+    # evaluation_server) can evaluate many work directories
+    # parameters_file: read the random variables straight from this Dakota parameters file of the work
+    #                  directory instead (see dakota_parameters), without a params.py
+    # response_names: default: the responses the parameters file asks for, or failure_indicator
+    # outputs: the named responses, one per line, as written to results.out
+    if parameters_file is None:
+        params = runpy.run_path(str(Path(directory) / "params.py"))
+        response_names = response_names or ["failure_indicator"]
+    else:
+        block = read_parameters(Path(directory) / parameters_file)
+        params = block.variables
+        response_names = response_names or block.responses
+    config = runpy.run_path(str(Path(directory) / "column_config.py"))
+
+    def analyze(DCR, e, L):
+        return analyze_column(
+            params["room_length1"],
+            params["room_length2"],
+            params["room_height"],
+            params["zeta"],
+            params["epsilon_steel_modulus"],
+            DCR,
+            L,
+            config["section_size"],
+            config["fire_load_fuel_energy_density"],
+            e=e,
+            epsilon_protection_specific_heat=params["epsilon_protection_specific_heat"],
+            epsilon_steel_thermal_strain=params["epsilon_steel_thermal_strain"],
+            epsilon_steel_thermal_conductivity=params["epsilon_steel_thermal_conductivity"],
+        )
+
+    responses = analyze(config["DCR"], config["e"], config["L"]).responses()
+    responses.update(grid_point_responses(analyze, config.get("grid_points", ())))
+    return "\n".join(f"{responses[name]}" for name in response_names)
 
 
+if __name__ == "__main__":
+    # the responses named on the command line (default: those the parameters file asks for, or
+    # failure_indicator) written to results.out;
+    # "--parameters <Dakota parameters file>" first reads the variables from that file instead of params.py
+    response_names = sys.argv[1:]
+    parameters_file = None
+    if response_names[:1] == ["--parameters"]:
+        parameters_file, response_names = response_names[1], response_names[2:]
+    results = evaluate_work_directory(response_names, parameters_file=parameters_file)
+    with open("results.out", "w") as f:
+        f.write(results)
+
 # column analysis:
 # initial_temp = steel_temperature[0]  # temperature change (°C)
 # time_step = np.diff(time)
@@ -119,30 +455,6 @@ effective_elastic_modulus = mech_mat_prop.elastic_modulus(
 # internal_force[1:] = np.cumsum(delta_F)
 # print(f"{max(internal_force) = }")
 
-
-# failure evaluation:
-capacity = np.pi**2 * effective_elastic_modulus * I / L**2  # MN
-demand = (
-    DCR * capacity[0]
-)  # * L / (np.sqrt(L**2 - (e * L) ** 2))  # + max(internal_force)
-if min(capacity) > demand:
-    out = 0
-else:
-    out = 1
-# print(out)
-with open("results.out", "w") as f:
-    f.write(f"{out}")
-
-# print(f"{max(capacity) = }")
-# print(f"{min(capacity) = }")
-# print(f"{(demand) = }")
-
-# plt.plot(steel_temperature, effective_elastic_modulus)
-# plt.show()
-
-# plt.plot(steel_temperature, capacity)
-# plt.show()
-
 # DCR_range = np.linspace(0, 1, 101)
 # critical_temps_array = np.zeros_like(DCR_range)
 # for j, DCR in enumerate(DCR_range):
@@ -263,3 +263,208 @@ class ParametricFireCurve(FireCurve):
         return np.array(
             fire_temp
         )  # consider condition, doesn't drop beneath 20 (room temp)
+
+
+class ParametricFireCurveBatch(FireCurve):
+    # vectorized ParametricFireCurve over many scenarios at once
+    # inputs: same as ParametricFireCurve, but zeta, room_length1, room_length2,
+    #         room_height and fire_fuel_load_energy_density may be arrays
+    #         (broadcast against each other, one entry per scenario)
+    # outputs: every derived quantity of ParametricFireCurve as an array of shape (n_scenarios,),
+    #          .time_array (hours) / .time_array_seconds, common to all scenarios
+    #          (as long as the longest scenario),
+    #          .n_steps (number of time steps of each scenario's own time array),
+    #          .fire_temp() (degrees Celsius), shape (n_scenarios, len(time_array)),
+    #          NaN past the end of each scenario's time array
+    def __init__(
+        self,
+        zeta,
+        occupancy,
+        thermal_conductivity,
+        density,
+        specific_heat,
+        window_base,
+        window_height,
+        room_length1,
+        room_length2,
+        room_height,
+        fire_fuel_load_energy_density,
+        F_ref=0.04,
+        b_ref=1160,
+        time_step_seconds=5,
+    ):
+        occupancy_data = {
+            "dwelling": ("medium", 20 / 60),
+            "hospital": ("medium", 20 / 60),
+            "hotel": ("medium", 20 / 60),
+            "library": ("fast", 15 / 60),
+            "office": ("medium", 20 / 60),
+            "classroom": ("medium", 20 / 60),
+            "shopping center": ("fast", 15 / 60),
+            "theatre": ("fast", 15 / 60),
+            "transport": ("slow", 25 / 60),
+        }
+        fire_growth_rate, t_lim_h = occupancy_data[occupancy]
+        zeta, room_length1, room_length2, room_height, fire_fuel_load_energy_density = (
+            np.broadcast_arrays(
+                *(
+                    np.atleast_1d(np.asarray(value, dtype=float))
+                    for value in (
+                        zeta,
+                        room_length1,
+                        room_length2,
+                        room_height,
+                        fire_fuel_load_energy_density,
+                    )
+                )
+            )
+        )
+        self.growth_rate = fire_growth_rate
+        self.ventilation_controlled_fire_duration = t_lim_h
+        self.zeta = zeta
+        self.thermal_conductivity = thermal_conductivity
+        self.density = density
+        self.specific_heat = specific_heat
+        self.window_base = window_base
+        self.window_height = window_height
+        self.room_length1 = room_length1
+        self.room_length2 = room_length2
+        self.room_height = room_height
+        self.reference_surface_area_of_unit_length = F_ref
+        self.reference_breadth_of_beam = b_ref
+        self.time_step_seconds = time_step_seconds
+        self.n_scenarios = zeta.size
+
+        self.sqrt_thermal_inertia = np.sqrt(
+            self.thermal_conductivity * self.density * self.specific_heat
+        )  # sqrt(thermal inertia) ((W*s^0.5)/((m^2)*K))
+
+        self.room_floor_area = self.room_length1 * self.room_length2
+        self.window_area = self.window_base * self.window_height  # m^2
+        self.window_opening_height = (self.window_base * (self.window_height**2)) / self.window_area  # m
+
+        self.room_total_internal_surface_area = 2 * (
+            self.room_length1 * self.room_length2
+            + self.room_length1 * self.room_height
+            + self.room_length2 * self.room_height
+        )  # m^2 for all floors
+
+        self.ventilation_factor = (1 - zeta) * (
+            self.window_area
+            * np.sqrt(self.window_opening_height)
+            / self.room_total_internal_surface_area
+        )  # m^0.5
+
+        self.fictitious_ratio = (
+            self.ventilation_factor / self.reference_surface_area_of_unit_length
+        ) ** 2 / (self.sqrt_thermal_inertia / self.reference_breadth_of_beam) ** 2
+        # gamma multiplier; multiply by the time to get the fictitious time
+
+        self.time_steps_coefficient = 3600 / self.time_step_seconds
+        self.set_fire_load(fire_fuel_load_energy_density)
+
+    def set_fire_load(self, fire_fuel_load_energy_density):
+        # (re)derive everything that depends on the fire load, keeping the room geometry, opening
+        # factor and gamma of the scenarios, so one set of sampled rooms can be reused across fire loads
+        self.fire_fuel_load_energy_density = np.broadcast_to(
+            np.atleast_1d(np.asarray(fire_fuel_load_energy_density, dtype=float)), self.zeta.shape
+        )
+        self.fuel_load_energy_density_per_unit_area_internal_room_surface = (
+            self.fire_fuel_load_energy_density
+            * self.room_floor_area
+            / self.room_total_internal_surface_area
+        )  # MJ/m^2
+
+        self.duration = np.maximum(
+            (0.2e-3)
+            * self.fuel_load_energy_density_per_unit_area_internal_room_surface
+            / self.ventilation_factor,
+            self.ventilation_controlled_fire_duration,
+        )
+        # output: the duration of the burning period (hours)
+
+        self.control = np.where(
+            self.duration == self.ventilation_controlled_fire_duration,
+            "fuel-controlled",
+            "ventilation-controlled",
+        )
+
+        self.fictitious_time = self.fictitious_ratio * self.duration  # hours
+        # find x for the decay period calculations
+
+        self.t_star_minutes = self.fictitious_time * 60  # minutes
+        self.x = np.where(
+            self.duration > self.ventilation_controlled_fire_duration,
+            1.0,
+            self.ventilation_controlled_fire_duration
+            * self.fictitious_ratio
+            / self.fictitious_time,
+        )
+
+        self.rounded_fictitous_duration = (
+            np.ceil(self.fictitious_time * self.time_steps_coefficient)
+            / self.time_steps_coefficient
+        )
+
+        self.max_fire_temp = 20 + 1325 * (
+            1
+            - 0.324 * np.exp(-0.2 * self.rounded_fictitous_duration)
+            - 0.204 * np.exp(-1.7 * self.rounded_fictitous_duration)
+            - 0.472 * np.exp(-19 * self.rounded_fictitous_duration)
+        )
+
+        # decay rate (degrees Celsius per hour) of each scenario, see ParametricFireCurve.fire_temp
+        self.decay_rate = np.select(
+            [
+                self.rounded_fictitous_duration <= 0.5,
+                self.rounded_fictitous_duration <= 2.0,
+            ],
+            [625.0, 250 * (3 - self.rounded_fictitous_duration)],
+            250.0,
+        )
+
+        # find the total fictitious duration
+        self.t_star_total = (
+            self.max_fire_temp - 20
+        ) / self.decay_rate + self.rounded_fictitous_duration * self.x
+        self.total_fictitious_duration = self.t_star_total
+        # round the total fictitious duration
+
+        self.rounded_total_fictitous_duration = (
+            np.ceil(self.total_fictitious_duration * self.time_steps_coefficient)
+            / self.time_steps_coefficient
+        )
+
+        # same length as np.arange(0, rounded_total_fictitous_duration * 3600, time_step_seconds);
+        # scenarios without a finite duration (non-physical inputs, e.g. no opening) get no steps,
+        # their rows of fire_temp are all NaN
+        n_steps = np.ceil(self.rounded_total_fictitous_duration * 3600 / self.time_step_seconds)
+        self.n_steps = np.where(np.isfinite(n_steps), n_steps, 0).astype(int)
+
+        # at least one time step, so that the histories of an all-NaN batch still have a first column
+        t = np.arange(max(self.n_steps.max(), 1)) * float(self.time_step_seconds)
+
+        self.time_array = t / 3600
+        self.time_array_seconds = t
+        # output: time array from t = 0 to the longest total fictitious duration (hours)
+
+    def fire_temp(self):
+        t = self.time_array
+        # burning period, shared by all scenarios
+        heating = 20 + 1325 * (
+            1
+            - 0.324 * np.exp(-0.2 * t)
+            - 0.204 * np.exp(-1.7 * t)
+            - 0.472 * np.exp(-19 * t)
+        )
+        # decay period, one row per scenario
+        decay = self.max_fire_temp[:, None] - self.decay_rate[:, None] * (
+            t[None, :] - (self.rounded_fictitous_duration * self.x)[:, None]
+        )
+        fire_temp = np.where(
+            t[None, :] <= self.rounded_fictitous_duration[:, None],
+            heating[None, :],
+            decay,
+        )
+        fire_temp[np.arange(t.size)[None, :] >= self.n_steps[:, None]] = np.nan
+        return fire_temp
@@ -0,0 +1,109 @@
+import numpy as np
+from scipy import stats
+
+# first- and second-order reliability methods in the independent standard normal space of the random
+# variables (see dakota_sampling.DakotaSamplingStudy.from_standard_normal): the design point is located
+# by an HL-RF iteration with a line search (improved HL-RF); gradients and Hessians are finite
+# differences evaluated as one batched call of the limit state
+
+
+class ReliabilityResult:
+    # beta: reliability index (negative when the median point already fails), pf_form: Phi(-beta),
+    # pf_sorm: Breitung's second-order correction (NaN before sorm() or where it does not apply),
+    # design_point: u* in the standard normal space, alpha: unit vector towards failure at u*,
+    # importance_factors: alpha**2 (sum to 1), curvatures: principal curvatures of the limit state at u*,
+    # iterations, evaluations (of the limit state), converged
+    def __init__(self, beta, design_point, alpha, iterations, evaluations, converged):
+        self.beta = beta
+        self.pf_form = stats.norm.cdf(-beta)
+        self.pf_sorm = np.nan
+        self.design_point = design_point
+        self.alpha = alpha
+        self.importance_factors = alpha**2
+        self.curvatures = None
+        self.iterations = iterations
+        self.evaluations = evaluations
+        self.converged = converged
+
+
+def gradient(limit_state, u, step):
+    # g(u) and forward difference gradient, one batched call of d + 1 points; directions in which the
+    # limit state is not finite (rejected, non-physical points) count as flat
+    values = limit_state(np.vstack([u, u + step * np.eye(u.size)]))
+    differences = (values[1:] - values[0]) / step
+    return values[0], np.where(np.isfinite(differences), differences, 0.0)
+
+
+def form(limit_state, dimension, step=0.05, tolerance=1e-3, limit_state_tolerance=1e-3, max_iterations=30):
+    # inputs: limit_state(u) -> g, shape (n,), for points u of shape (n, dimension) of the independent
+    #         standard normal space (e.g. limit_states.CapacityRatioLimitState), failure where g <= 0,
+    #         step: finite difference step (wide enough to step over the limit state's resolution, e.g. the
+    #         time discretization of critical_DCR), tolerance: on the change of |u*| between iterations,
+    #         limit_state_tolerance: on |g(u*)|, in the units of g
+    # outputs: ReliabilityResult
+    u = np.zeros(dimension)
+    line_search_steps = 0.5 ** np.arange(6)
+    evaluations = 0
+    g0 = None
+    previous_norm = np.inf
+    for iteration in range(1, max_iterations + 1):
+        g, grad = gradient(limit_state, u, step)
+        evaluations += dimension + 1
+        g0 = g if g0 is None else g0
+        grad_norm = np.linalg.norm(grad)
+        if grad_norm == 0:
+            break
+        alpha = -grad / grad_norm
+
+        # HL-RF step: design point of the limit state linearized at u
+        direction = (grad @ u - g) / grad_norm**2 * grad - u
+        if abs(np.linalg.norm(u) - previous_norm) < tolerance and abs(g) <= limit_state_tolerance:
+            return ReliabilityResult(np.sign(g0) * np.linalg.norm(u), u, alpha, iteration, evaluations, True)
+
+        # line search on the merit function 0.5 * |u|^2 + c * |g|, all step lengths in one batched call
+        c = 2 * np.linalg.norm(u) / grad_norm + 10
+        candidates = u + line_search_steps[:, None] * direction
+        candidate_g = limit_state(candidates)
+        evaluations += line_search_steps.size
+        merit = 0.5 * np.sum(candidates**2, axis=1) + c * np.abs(candidate_g)
+        decreasing = np.isfinite(candidate_g) & (merit < 0.5 * u @ u + c * abs(g))
+        if not np.any(decreasing) and not np.isfinite(candidate_g[-1]):
+            break  # every step length leaves the region where the limit state is finite
+        previous_norm = np.linalg.norm(u)
+        u = candidates[np.argmax(decreasing) if np.any(decreasing) else -1]
+
+    g, grad = gradient(limit_state, u, step)
+    evaluations += dimension + 1
+    alpha = -grad / np.linalg.norm(grad) if np.any(grad) else np.zeros(dimension)
+    return ReliabilityResult(np.sign(g0) * np.linalg.norm(u), u, alpha, max_iterations, evaluations, False)
+
+
+def sorm(limit_state, result, step=0.25):
+    # Breitung's formula pf = Phi(-beta) * prod (1 + beta * kappa_i) ** -0.5 from the principal curvatures
+    # kappa_i of the limit state at the design point of a FORM result (updated in place and returned);
+    # for beta < 0 it is applied to the safe domain, pf = 1 - Phi(beta) * prod (1 + beta * kappa_i) ** -0.5;
+    # step is wider than form's, since second differences amplify the resolution steps of g
+    u = result.design_point
+    dimension = u.size
+    # gradients at u and at u + step * e_j, one batched call of (d + 1)^2 points
+    points = np.vstack([u, u + step * np.eye(dimension)])
+    values = limit_state(np.vstack([np.vstack([p, p + step * np.eye(dimension)]) for p in points]))
+    result.evaluations += values.size
+    values = values.reshape(dimension + 1, dimension + 1)
+    gradients = (values[:, 1:] - values[:, :1]) / step
+    hessian = (gradients[1:] - gradients[0]) / step
+    hessian = (hessian + hessian.T) / 2
+
+    # curvatures: the Hessian on the tangent plane of the limit state, scaled by |gradient|
+    grad_norm = np.linalg.norm(gradients[0])
+    alpha = -gradients[0] / grad_norm
+    basis, _ = np.linalg.qr(np.column_stack([alpha, np.eye(dimension)]))
+    tangent = basis[:, 1:dimension]
+    result.curvatures = np.linalg.eigvalsh(tangent.T @ hessian @ tangent / grad_norm)
+    factors = 1 + result.beta * result.curvatures
+    if np.all(factors > 0):
+        if result.beta >= 0:
+            result.pf_sorm = result.pf_form * np.prod(factors**-0.5)
+        else:
+            result.pf_sorm = 1 - (1 - result.pf_form) * np.prod(factors**-0.5)
+    return result
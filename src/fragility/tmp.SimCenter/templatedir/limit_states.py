@@ -0,0 +1,63 @@
+import numpy as np
+from column_analysis import analyze_column_batch, column_database_path, placeholder_variables
+
+# limit states of the column analysis for reliability methods (subset_simulation, ...), in the
+# independent standard normal space of the dakota.in random variables that the analysis uses (the
+# column_analysis.placeholder_variables are left at their medians, they would only add inert dimensions
+# to Metropolis chains and finite-difference gradients); failure where g <= 0
+
+
+class CapacityRatioLimitState:
+    # g = critical_DCR - DCR, i.e. min(capacity) / capacity[0] - DCR: the column fails
+    # (min(capacity) <= DCR * capacity[0], as in analyze_column) exactly where g <= 0
+    # u is clipped to +-u_limit, beyond which the inverse CDFs of the random variables turn infinite;
+    # points whose analysis is still not finite (non-physical inputs) are rejected with g = +inf, which
+    # subset simulation never accepts and FORM's line search never chooses
+    # inputs: study: dakota_sampling.DakotaSamplingStudy (the random variables),
+    #         DCR, L (m), section_size, fire_load_fuel_energy_density, e: column configuration
+    # outputs: __call__(u) -> g, shape (n,), for points u of shape (n, .dimension);
+    #          .descriptors: the random variables of u's columns, .dimension: their number,
+    #          .evaluations: number of column analyses so far
+    def __init__(
+        self,
+        study,
+        DCR,
+        L,
+        section_size,
+        fire_load_fuel_energy_density,
+        e=0,
+        column_database_path=column_database_path,
+        thermal_properties=None,
+    ):
+        self.study = study
+        self.DCR = DCR
+        self.L = L
+        self.section_size = section_size
+        self.fire_load_fuel_energy_density = fire_load_fuel_energy_density
+        self.e = e
+        self.column_database_path = column_database_path
+        self.thermal_properties = thermal_properties
+        self.evaluations = 0
+        self.u_limit = 8.0
+        self.columns = [j for j, descriptor in enumerate(study.descriptors) if descriptor not in placeholder_variables]
+        self.descriptors = [study.descriptors[j] for j in self.columns]
+        self.dimension = len(self.columns)
+
+    def __call__(self, u):
+        u = np.atleast_2d(u)
+        study_u = np.zeros((u.shape[0], len(self.study.variables)))
+        study_u[:, self.columns] = np.clip(u, -self.u_limit, self.u_limit)
+        design = self.study.from_standard_normal(study_u)
+        result = analyze_column_batch(
+            **self.study.as_dict(design),
+            DCR=self.DCR,
+            L=self.L,
+            section_size=self.section_size,
+            fire_load_fuel_energy_density=self.fire_load_fuel_energy_density,
+            e=self.e,
+            column_database_path=self.column_database_path,
+            thermal_properties=self.thermal_properties,
+        )
+        self.evaluations += design.shape[0]
+        g = np.asarray(result.critical_DCR) - self.DCR
+        return np.where(np.isfinite(g), g, np.inf)
@@ -0,0 +1,43 @@
+import numpy as np
+from scipy import stats
+
+# sequential estimation of a failure probability: batches of samples are added until the binomial
+# confidence interval on pf is narrower than a target width or a sample budget is spent, so grid points
+# with pf near 0 or 1 stop early and points near 0.5 get enough samples for the lognormal fit
+
+
+def binomial_confidence_interval(failures, samples, confidence=0.95):
+    # Clopper-Pearson (exact) interval on pf, given the number of failures among samples
+    alpha = 1 - confidence
+    lower = stats.beta.ppf(alpha / 2, failures, samples - failures + 1) if failures > 0 else 0.0
+    upper = stats.beta.ppf(1 - alpha / 2, failures + 1, samples - failures) if failures < samples else 1.0
+    return lower, upper
+
+
+class SequentialEstimate:
+    # pf: failure probability, samples: number of samples used,
+    # interval: (lower, upper) confidence interval on pf, converged: interval narrower than the target width
+    def __init__(self, pf, samples, interval, converged):
+        self.pf = pf
+        self.samples = samples
+        self.interval = interval
+        self.converged = converged
+
+
+def sequential_failure_probability(batch_failures, width=0.1, confidence=0.95, max_samples=960):
+    # inputs: batch_failures(k) -> failure indicators (0/1 array) of the k-th batch of samples,
+    #         width: target width of the confidence interval on pf, confidence: its confidence level,
+    #         max_samples: sample budget (the last batch may overshoot it)
+    # outputs: SequentialEstimate
+    failures = 0
+    samples = 0
+    k = 0
+    while True:
+        indicators = np.asarray(batch_failures(k))
+        failures += int(np.sum(indicators))
+        samples += indicators.size
+        k += 1
+        interval = binomial_confidence_interval(failures, samples, confidence)
+        converged = interval[1] - interval[0] <= width
+        if converged or samples >= max_samples:
+            return SequentialEstimate(failures / samples, samples, interval, converged)
@@ -0,0 +1,111 @@
+import time
+import numpy as np
+import fire_curves
+import material_properties
+import thermal_analyses
+
+# compares the analytic SteelThermalProperties with the table-backed
+# TabulatedSteelThermalProperties inside SimplifiedUnprotected:
+# run time of the scalar and the batched integrator, and the largest
+# steel temperature difference between the two property providers
+# (scalar lookups of the tabulated provider use the analytic formulas,
+# so only the batched integrator is expected to speed up)
+
+# parametric fire parameters (as in column_analysis.py):
+occupancy = "office"
+concrete_thermal_conductivity = 1.6
+concrete_density = 2300
+concrete_specific_heat = 980
+window_base = 3  # m
+window_height = 2  # m
+convective_heat_transfer_coefficient = 35  # W/m^2 K
+material_emissivity = 0.7
+contour_protection_section_factor = 150  # 1/m
+board_protection_section_factor = 110  # 1/m
+
+n_samples = 256
+rng = np.random.default_rng(439)
+zeta = rng.lognormal(np.log(0.2 / np.sqrt(2)), np.sqrt(np.log(2)), n_samples)
+room_length1 = rng.uniform(5, 10, n_samples)
+room_length2 = rng.uniform(3, 8, n_samples)
+room_height = rng.uniform(2.5, 3.2, n_samples)
+fire_load_fuel_energy_density = rng.uniform(500, 4000, n_samples)
+
+
+def run_scalar(thermal_properties):
+    steel_temperatures = []
+    for i in range(n_samples):
+        fire_curve = fire_curves.ParametricFireCurve(
+            zeta[i],
+            occupancy,
+            concrete_thermal_conductivity,
+            concrete_density,
+            concrete_specific_heat,
+            window_base,
+            window_height,
+            room_length1[i],
+            room_length2[i],
+            room_height[i],
+            fire_load_fuel_energy_density[i],
+        )
+        thermal_analysis = thermal_analyses.SimplifiedUnprotected(thermal_properties=thermal_properties)
+        steel_temperatures.append(
+            thermal_analysis.get_component_temperature(
+                fire_curve.time_array_seconds,
+                fire_curve.fire_temp(),
+                convective_heat_transfer_coefficient,
+                material_emissivity,
+                contour_protection_section_factor=contour_protection_section_factor,
+                board_protection_section_factor=board_protection_section_factor,
+            )
+        )
+    return steel_temperatures
+
+
+def run_batch(thermal_properties):
+    fire_curve = fire_curves.ParametricFireCurveBatch(
+        zeta,
+        occupancy,
+        concrete_thermal_conductivity,
+        concrete_density,
+        concrete_specific_heat,
+        window_base,
+        window_height,
+        room_length1,
+        room_length2,
+        room_height,
+        fire_load_fuel_energy_density,
+    )
+    thermal_analysis = thermal_analyses.SimplifiedUnprotected(thermal_properties=thermal_properties)
+    return thermal_analysis.get_component_temperature_batch(
+        fire_curve.time_array_seconds,
+        fire_curve.fire_temp(),
+        convective_heat_transfer_coefficient,
+        material_emissivity,
+        contour_protection_section_factor=contour_protection_section_factor,
+        board_protection_section_factor=board_protection_section_factor,
+    )
+
+
+if __name__ == "__main__":
+    analytic = material_properties.SteelThermalProperties()
+    start = time.perf_counter()
+    tabulated = material_properties.TabulatedSteelThermalProperties()
+    print(f"table build: {time.perf_counter() - start:.3f} s")
+
+    for name, run in [("scalar", run_scalar), ("batch", run_batch)]:
+        start = time.perf_counter()
+        analytic_steel_temperature = run(analytic)
+        analytic_time = time.perf_counter() - start
+        start = time.perf_counter()
+        tabulated_steel_temperature = run(tabulated)
+        tabulated_time = time.perf_counter() - start
+        max_difference = max(
+            np.nanmax(np.abs(a - b))
+            for a, b in zip(analytic_steel_temperature, tabulated_steel_temperature)
+        )
+        print(
+            f"{name}: analytic {analytic_time:.3f} s, tabulated {tabulated_time:.3f} s "
+            f"(x{analytic_time / tabulated_time:.1f}), "
+            f"max steel temperature difference {max_difference:.4f} C"
+        )
@@ -0,0 +1,84 @@
+import numpy as np
+
+# subset simulation (Au & Beck, 2001) for small failure probabilities: pf = P(g(U) <= 0) is written as a
+# product of conditional probabilities of nested intermediate failure events g <= b_1 > b_2 > ... > 0, each
+# estimated from samples generated by modified Metropolis chains started at the previous level's failures;
+# all chains of a level advance together, so each step is one batched call of the limit state
+
+
+class SubsetSimulationResult:
+    # pf: failure probability, thresholds: intermediate thresholds b_1, b_2, ... (last one 0),
+    # evaluations: number of limit state evaluations,
+    # coefficient_of_variation: estimate of pf's, ignoring the correlation of samples within a chain
+    # (a lower bound), converged: the failure region (g <= 0) was reached within max_levels
+    def __init__(self, pf, thresholds, evaluations, coefficient_of_variation, converged):
+        self.pf = pf
+        self.thresholds = thresholds
+        self.evaluations = evaluations
+        self.coefficient_of_variation = coefficient_of_variation
+        self.converged = converged
+
+
+def subset_simulation(
+    limit_state,
+    dimension,
+    samples_per_level=1000,
+    conditional_probability=0.1,
+    max_levels=6,
+    proposal_spread=1.0,
+    seed=None,
+):
+    # inputs: limit_state(u) -> g, shape (n,), for points u of shape (n, dimension) of the independent
+    #         standard normal space (e.g. limit_states.CapacityRatioLimitState), failure where g <= 0,
+    #         samples_per_level: N, conditional_probability: p0 (N * p0 chains per level),
+    #         max_levels: levels before giving up (pf then uses the last level's failures, 0 if none),
+    #         proposal_spread: half width of the component-wise uniform proposal
+    # outputs: SubsetSimulationResult
+    rng = np.random.default_rng(seed)
+    n_seeds = int(round(samples_per_level * conditional_probability))
+    chain_length = samples_per_level // n_seeds
+
+    u = rng.standard_normal((samples_per_level, dimension))
+    g = limit_state(u)
+    evaluations = samples_per_level
+    pf = 1.0
+    thresholds = []
+    squared_cov = 0.0
+    for level in range(max_levels):
+        failures = np.count_nonzero(g <= 0)
+        if failures >= n_seeds or level == max_levels - 1:
+            probability = failures / g.size
+            pf *= probability
+            thresholds.append(0.0)
+            if failures > 0:
+                squared_cov += (1 - probability) / (probability * g.size)
+            return SubsetSimulationResult(pf, thresholds, evaluations, np.sqrt(squared_cov), failures > 0)
+
+        # next intermediate threshold: the p0-quantile of g
+        order = np.argsort(g)
+        threshold = (g[order[n_seeds - 1]] + g[order[n_seeds]]) / 2
+        thresholds.append(float(threshold))
+        pf *= conditional_probability
+        squared_cov += (1 - conditional_probability) / (conditional_probability * samples_per_level)
+
+        # modified Metropolis chains from the samples below the threshold
+        current_u = u[order[:n_seeds]]
+        current_g = g[order[:n_seeds]]
+        level_u = [current_u]
+        level_g = [current_g]
+        for step in range(chain_length - 1):
+            candidate = current_u + proposal_spread * rng.uniform(-1, 1, current_u.shape)
+            ratio = np.exp(-0.5 * (candidate**2 - current_u**2))
+            candidate = np.where(rng.random(current_u.shape) < ratio, candidate, current_u)
+            moved = np.any(candidate != current_u, axis=1)
+            candidate_g = current_g.copy()
+            if np.any(moved):
+                candidate_g[moved] = limit_state(candidate[moved])
+                evaluations += np.count_nonzero(moved)
+            accept = candidate_g <= threshold
+            current_u = np.where(accept[:, None], candidate, current_u)
+            current_g = np.where(accept, candidate_g, current_g)
+            level_u.append(current_u)
+            level_g.append(current_g)
+        u = np.concatenate(level_u)
+        g = np.concatenate(level_g)
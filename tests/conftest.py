@@ -0,0 +1,37 @@
+import sys
+from pathlib import Path
+import numpy as np
+import pytest
+
+# the modules are plain scripts importable from their directories (src: the column analysis, as
+# copied into the templatedirs; all_files: the sweep driver's helpers), as when they are run there
+repository = Path(__file__).resolve().parent.parent
+for directory in ("src", "all_files"):
+    if str(repository / directory) not in sys.path:
+        sys.path.insert(0, str(repository / directory))
+
+
+@pytest.fixture
+def dakota_input_path():
+    # the random variables of the sweeps
+    return repository / "all_files" / "tmp.SimCenter" / "dakota.in"
+
+
+@pytest.fixture
+def sampled_rooms():
+    # (zeta, room_length1, room_length2, room_height, fire load) of a few sampled office rooms
+    rng = np.random.default_rng(1)
+    n_samples = 6
+    return (
+        rng.uniform(0.02, 0.2, n_samples),
+        rng.uniform(5, 10, n_samples),
+        rng.uniform(3, 8, n_samples),
+        rng.uniform(2.5, 3.2, n_samples),
+        rng.uniform(500, 4000, n_samples),
+    )
+
+
+@pytest.fixture
+def fire_parameters():
+    # occupancy, concrete conductivity, density and specific heat, window base and height (as in column_analysis.py)
+    return ("office", 1.6, 2300, 980, 3, 2)
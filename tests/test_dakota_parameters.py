@@ -0,0 +1,50 @@
+import pytest
+from dakota_parameters import read_parameter_blocks, read_parameters
+
+# one evaluation's parameters, as Dakota writes them in each format
+standard_block = """                                       2 variables
+                       5.1000000000000000e+00 room_length1
+                       2.9000000000000000e+00 room_height
+                                       2 functions
+                                       1 ASV_1:critical_DCR
+                                       1 ASV_2:failure_indicator
+                                       2 derivative_variables
+                                       1 DVV_1:room_length1
+                                       2 DVV_2:room_height
+                                       0 analysis_components
+                                    {eval_id} eval_id
+"""
+aprepro_block = """{{ DAKOTA_VARS     =                      2 }}
+{{ room_length1    =  5.1000000000000000e+00 }}
+{{ room_height     =  2.9000000000000000e+00 }}
+{{ DAKOTA_FNS      =                      2 }}
+{{ ASV_1:critical_DCR =                   1 }}
+{{ ASV_2:failure_indicator =              1 }}
+{{ DAKOTA_DER_VARS =                      2 }}
+{{ DVV_1:room_length1 =                   1 }}
+{{ DVV_2:room_height =                    2 }}
+{{ DAKOTA_AN_COMPS =                      0 }}
+{{ DAKOTA_EVAL_ID  =                  {eval_id} }}
+"""
+
+
+@pytest.mark.parametrize("block", [standard_block, aprepro_block], ids=["standard", "aprepro"])
+def test_read_parameters(tmp_path, block):
+    path = tmp_path / "params.in"
+    path.write_text(block.format(eval_id="12"))
+    parameters = read_parameters(path)
+    assert parameters.variables == {"room_length1": 5.1, "room_height": 2.9}
+    assert parameters.eval_id == "12"
+    assert parameters.responses == ["critical_DCR", "failure_indicator"]
+
+
+@pytest.mark.parametrize("block", [standard_block, aprepro_block], ids=["standard", "aprepro"])
+def test_read_batch_parameter_blocks(tmp_path, block):
+    # a batch interface's parameters file holds the blocks of all its evaluations, one after another
+    path = tmp_path / "params.in"
+    path.write_text("".join(block.format(eval_id=f"3:{i}") for i in range(1, 4)))
+    blocks = read_parameter_blocks(path)
+    assert [parameters.eval_id for parameters in blocks] == ["3:1", "3:2", "3:3"]
+    assert all(parameters.variables == {"room_length1": 5.1, "room_height": 2.9} for parameters in blocks)
+    with pytest.raises(ValueError):
+        read_parameters(path)
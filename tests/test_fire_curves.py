@@ -0,0 +1,27 @@
+import numpy as np
+import fire_curves
+
+
+def test_batch_fire_curve_matches_scalar(sampled_rooms, fire_parameters):
+    zeta, room_length1, room_length2, room_height, fire_load = sampled_rooms
+    batch = fire_curves.ParametricFireCurveBatch(zeta, *fire_parameters, room_length1, room_length2, room_height, fire_load)
+    fire_temperature = batch.fire_temp()
+    for i in range(len(zeta)):
+        scalar = fire_curves.ParametricFireCurve(
+            zeta[i], *fire_parameters, room_length1[i], room_length2[i], room_height[i], fire_load[i]
+        )
+        n_steps = len(scalar.time_array_seconds)
+        assert batch.n_steps[i] == n_steps
+        np.testing.assert_array_equal(batch.time_array_seconds[:n_steps], scalar.time_array_seconds)
+        np.testing.assert_allclose(fire_temperature[i, :n_steps], scalar.fire_temp(), rtol=1e-12)
+        # each scenario's row is NaN-padded beyond its own duration
+        assert np.all(np.isnan(fire_temperature[i, n_steps:]))
+
+
+def test_set_fire_load_matches_a_new_batch(sampled_rooms, fire_parameters):
+    zeta, room_length1, room_length2, room_height, fire_load = sampled_rooms
+    batch = fire_curves.ParametricFireCurveBatch(zeta, *fire_parameters, room_length1, room_length2, room_height, 0)
+    batch.set_fire_load(fire_load)
+    fresh = fire_curves.ParametricFireCurveBatch(zeta, *fire_parameters, room_length1, room_length2, room_height, fire_load)
+    np.testing.assert_array_equal(batch.time_array_seconds, fresh.time_array_seconds)
+    np.testing.assert_array_equal(batch.fire_temp(), fresh.fire_temp())
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from scipy import stats
+from column_analysis import ColumnSampleDesign
+from dakota_sampling import DakotaSamplingStudy
+from form_sorm import form, sorm
+from limit_states import CapacityRatioLimitState
+
+
+def test_form_stays_in_the_physical_region(dakota_input_path):
+    # the HL-RF iteration used to step far enough into the tails for the inverse CDFs to turn infinite,
+    # and the resulting NaN fire durations crashed the batch thermal analysis
+    study = DakotaSamplingStudy(dakota_input_path)
+    limit_state = CapacityRatioLimitState(study, 0.95, 1 / 3.281, "W30X124", 3400.0, e=0.0)
+    result = form(limit_state, limit_state.dimension)
+    assert np.isfinite(result.beta)
+    assert np.all(np.isfinite(result.design_point))
+
+
+def test_limit_state_rejects_non_finite_points(dakota_input_path):
+    study = DakotaSamplingStudy(dakota_input_path)
+    limit_state = CapacityRatioLimitState(study, 0.95, 1 / 3.281, "W30X124", 3400.0)
+    u = np.zeros((3, limit_state.dimension))
+    u[0, 0] = -1e4  # clipped to u_limit
+    u[2] = np.nan
+    g = limit_state(u)
+    assert np.all(np.isfinite(g[:2]))
+    assert g[2] == np.inf
+
+
+@pytest.mark.filterwarnings("ignore:invalid value encountered:RuntimeWarning")  # the NaN durations
+def test_batch_analysis_tolerates_non_physical_samples():
+    # zeta = 1 (no opening) gives the fire curve no finite duration; with only such samples the
+    # histories still have one (NaN) column
+    for zeta in ([1.0, 0.2], [1.0]):
+        n = len(zeta)
+        design = ColumnSampleDesign(np.full(n, 7.0), np.full(n, 5.0), np.full(n, 3.0), np.array(zeta), np.zeros(n), "W14X68")
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result = design.analyze(3000.0, 0.5, 1.0)
+        assert np.isnan(result.critical_DCR[0])
+        assert np.all(np.isfinite(result.critical_DCR[1:]))
+
+
+@pytest.mark.parametrize("beta", [2.5, -1.0])
+def test_form_on_a_linear_limit_state(beta):
+    # g(u) = beta - alpha . u with a unit alpha has its design point at beta * alpha and pf = Phi(-beta)
+    # exactly, and no curvature for SORM to correct
+    alpha = np.array([0.6, -0.48, 0.64])
+    result = sorm(lambda u: beta - u @ alpha, form(lambda u: beta - u @ alpha, 3))
+    assert result.converged
+    assert result.beta == pytest.approx(beta, abs=1e-6)
+    np.testing.assert_allclose(result.design_point, beta * alpha, atol=1e-6)
+    np.testing.assert_allclose(result.importance_factors, alpha**2, atol=1e-6)
+    assert result.pf_form == pytest.approx(stats.norm.cdf(-beta))
+    assert result.pf_sorm == pytest.approx(result.pf_form, rel=1e-6)
@@ -0,0 +1,30 @@
+import numpy as np
+import material_properties
+
+
+def random_points(n_points=100000, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(20, 1200, n_points), rng.uniform(-3, 3, n_points)
+
+
+def test_tabulated_properties_within_the_documented_tolerance():
+    analytic = material_properties.SteelThermalProperties()
+    tabulated = material_properties.TabulatedSteelThermalProperties()
+    T, epsilon = random_points()
+    specific_heat_error = np.abs(tabulated.specific_heat(T) / analytic.specific_heat(T) - 1)
+    assert specific_heat_error.max() < 0.02
+    assert specific_heat_error[np.abs(T - 735) > 15].max() < 1e-3  # away from the peak
+    assert np.abs(tabulated.thermal_conductivity(T, epsilon) - analytic.thermal_conductivity(T, epsilon)).max() < 1e-3
+    assert np.abs(tabulated.thermal_strain(T, epsilon) - analytic.thermal_strain(T, epsilon)).max() < 6e-6
+
+
+def test_tabulated_properties_fall_back_to_the_formulas():
+    analytic = material_properties.SteelThermalProperties()
+    tabulated = material_properties.TabulatedSteelThermalProperties(epsilon_limit=2.0)
+    # scalars, epsilons off the grid and temperatures next to a discontinuity use the analytic formulas
+    assert tabulated.thermal_strain(500.0, 0.3) == analytic.thermal_strain(500.0, 0.3)
+    T = np.array([300.0, 750.0, 860.5])
+    epsilon = np.array([2.5, 0.0, 0.0])
+    np.testing.assert_array_equal(tabulated.thermal_strain(T, epsilon), analytic.thermal_strain(T, epsilon))
+    T = np.array([799.5, 800.5])
+    np.testing.assert_array_equal(tabulated.thermal_conductivity(T, 0.0), analytic.thermal_conductivity(T, 0.0))
@@ -0,0 +1,43 @@
+import numpy as np
+from result_store import ResultStore
+from sweep_scheduler import expand_grid, pending_tasks
+from in_process_modes import stored_results
+
+
+def test_results_survive_a_restart(tmp_path):
+    path = tmp_path / "results.sqlite"
+    store = ResultStore(path)
+    DCR = np.arange(0.95, 0, -0.05)[9]  # 0.49999999999999994 and similar must find 0.5's row
+    store.put([("W14X68", 0.0, 1, DCR, 3400, 0.25)], [{"samples": 96, "interval": np.array([0.2, 0.3])}])
+    store.close()
+
+    store = ResultStore(path)
+    key = ResultStore.key("W14X68", 0, 1.0, 0.5, 3400.0)
+    assert store.load() == {key: 0.25}
+    assert store.load_details() == {key: {"samples": 96, "interval": [0.2, 0.3]}}
+    store.close()
+
+
+def test_pending_tasks_skip_finished_studies():
+    tasks = expand_grid(["W14X68"], [0.0], [1], [0.5, 0.3], [3400, 3000, 2600], "per_DCR")
+    # DCR 0.5 is only done at 3400; DCR 0.3 reached pf = 0 at 3000, which also finishes it at 2600
+    results = {task.name: 0.0 if task.fire_load == 3000 else 0.1 for task in tasks if task.fire_load != 2600}
+    del results[[task for task in tasks if task.DCR == 0.5 and task.fire_load == 3000][0].name]
+    pending = pending_tasks(tasks, results, lambda pf: pf == 0)
+    assert [(task.DCR, task.fire_load) for task in pending] == [(0.5, 3000), (0.5, 2600)]
+
+
+def test_stored_results_resume_without_recomputing(tmp_path):
+    path = tmp_path / "results_form.sqlite"
+    point_groups = [[("W14X68", 0.0, 1, 0.5)], [("W14X68", 0.0, 1, 0.3)]]
+    calls = []
+
+    def compute(fire_load, point):
+        calls.append((fire_load, point[3]))
+        return point[3] * fire_load / 4000, {"samples": 96}
+
+    first = stored_results(path, [3400, 3000], point_groups, compute)
+    assert len(calls) == 4
+    second = stored_results(path, [3400, 3000, 2600], point_groups, compute)
+    assert calls[4:] == [(2600, 0.5), (2600, 0.3)]  # only the new fire load is computed
+    assert second[:2] == first
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from scipy import stats
+from sequential_sampling import binomial_confidence_interval, sequential_failure_probability
+
+
+@pytest.mark.parametrize("failures, samples", [(0, 20), (1, 20), (5, 20), (19, 20), (20, 20), (37, 960)])
+def test_clopper_pearson_bounds(failures, samples):
+    lower, upper = binomial_confidence_interval(failures, samples, confidence=0.95)
+    assert 0 <= lower <= failures / samples <= upper <= 1
+    # each bound is where seeing the observed count or a more extreme one has probability alpha / 2
+    if failures > 0:
+        assert stats.binom.sf(failures - 1, samples, lower) == pytest.approx(0.025)
+    else:
+        assert lower == 0
+    if failures < samples:
+        assert stats.binom.cdf(failures, samples, upper) == pytest.approx(0.025)
+    else:
+        assert upper == 1
+
+
+def test_clopper_pearson_reference_values():
+    # 5 of 20: (0.0866, 0.4910); 0 of 20: upper bound 1 - 0.025 ** (1 / 20)
+    assert binomial_confidence_interval(5, 20) == pytest.approx((0.08657, 0.49105), abs=1e-5)
+    assert binomial_confidence_interval(0, 20)[1] == pytest.approx(1 - 0.025 ** (1 / 20))
+
+
+def test_sequential_sampling_stops_at_the_target_width():
+    rng = np.random.default_rng(0)
+    estimate = sequential_failure_probability(lambda k: rng.random(96) < 0.3, width=0.1, max_samples=9600)
+    assert estimate.converged
+    assert estimate.interval[1] - estimate.interval[0] <= 0.1
+    assert estimate.samples % 96 == 0 and estimate.samples < 9600
+    # a budget too small for the target width ends the sampling unconverged
+    estimate = sequential_failure_probability(lambda k: np.zeros(96), width=0.001, max_samples=960)
+    assert not estimate.converged and estimate.samples == 960 and estimate.pf == 0
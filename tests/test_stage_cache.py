@@ -0,0 +1,48 @@
+import os
+import numpy as np
+import pytest
+from stage_cache import StageCache, stage_key
+
+
+def entry(value, size=1000):
+    # one stage output of size float64 values
+    return (np.full(size, float(value)),)
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = StageCache(max_bytes=3 * 8000)
+    for key in "abc":
+        cache.cached(key, lambda: entry(1))
+    cache.cached("a", lambda: entry(2))  # a hit, so b is now the least recently used
+    cache.cached("d", lambda: entry(1))
+    assert list(cache.entries) == ["c", "a", "d"]
+    assert cache.bytes == 3 * 8000
+    assert (cache.hits, cache.misses) == (1, 4)
+    # the stored arrays are shared, hence read-only
+    with pytest.raises(ValueError):
+        cache.get("a")[0][0] = 0
+
+
+def test_disk_tier_is_shared_and_evicted_down_to_its_low_water_mark(tmp_path):
+    writer = StageCache(max_bytes=0, directory=tmp_path, max_disk_bytes=10**6)
+    for i, key in enumerate("abcd"):
+        writer.cached(key, lambda: entry(i))
+        os.utime(tmp_path / f"{key}.npz", (i, i))  # a is the least recently used file
+    size = (tmp_path / "a.npz").stat().st_size
+    (tmp_path / "in_flight.tmp").write_bytes(b"x" * size)  # another process's entry being written
+
+    # another process reads the entries from disk without computing them
+    reader = StageCache(directory=tmp_path, max_disk_bytes=4.5 * size)
+    np.testing.assert_array_equal(reader.cached("c", lambda: entry(-1))[0], entry(2)[0])
+    assert reader.disk_bytes == 4 * size  # the .tmp file is not part of the tier
+
+    # its next write goes over the cap, and the tier is evicted down to 0.75 of it, oldest files first
+    reader.cached("e", lambda: entry(4))
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["c.npz", "d.npz", "e.npz", "in_flight.tmp"]
+    assert reader.disk_bytes == 3 * size
+
+
+def test_stage_keys_follow_the_inputs():
+    assert stage_key("fire curve", np.array([1.0, 2.0]), "office") == stage_key("fire curve", [1.0, 2.0], "office")
+    assert stage_key("fire curve", np.array([1.0, 2.0])) != stage_key("fire curve", np.array([1.0, 2.5]))
+    assert stage_key("fire curve", 1.0) != stage_key("steel temperature", 1.0)
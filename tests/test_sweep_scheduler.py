@@ -0,0 +1,34 @@
+from sweep_scheduler import SweepTask, expand_grid, run_sweep, series_results
+
+
+def failure_probability(task):
+    # pf falling with the fire load; the study at fire load index 1 of DCR 0.3 raises
+    if task.DCR == 0.3 and task.fire_load_index == 1:
+        raise RuntimeError("study failed")
+    return max(0.0, task.fire_load - 2000.0) / 2000.0 * task.DCR
+
+
+def test_run_sweep_drops_studies_below_pf_zero():
+    tasks = expand_grid(["W14X68"], [0.0], [1], [0.5], [3400.0, 2000.0, 1800.0, 1600.0], "per_DCR")
+    results = run_sweep(tasks, failure_probability, max_workers=1, is_zero=lambda pf: pf == 0)
+    # the series reaches pf = 0 at 2000, so the studies at lower fire loads never start
+    assert sorted(results) == [tasks[0].name, tasks[1].name]
+    values = series_results(tasks, results, lambda pf: pf == 0, 0.0, float("nan"))
+    assert values == [0.35, 0.0, 0.0, 0.0]
+
+
+def test_run_sweep_records_failures_and_runs_the_rest():
+    tasks = expand_grid(["W14X68"], [0.0], [1], [0.5, 0.3], [3400.0, 3000.0, 2600.0], "per_DCR")
+    failed = []
+    results = run_sweep(
+        tasks,
+        failure_probability,
+        max_workers=2,
+        is_zero=lambda pf: pf == 0,
+        on_failure=lambda task, error: failed.append((task.name, str(error))),
+    )
+    assert failed == [(SweepTask("W14X68", 0.0, 1, 0.3, 3000.0, 1).name, "study failed")]
+    assert len(results) == len(tasks) - 1
+    series_tasks = [task for task in tasks if task.DCR == 0.3]
+    values = series_results(series_tasks, results, lambda pf: pf == 0, 0.0, -1.0)
+    assert values[1] == -1.0
@@ -0,0 +1,36 @@
+import numpy as np
+import fire_curves
+import thermal_analyses
+
+# heat transfer parameters (as in column_analysis.py)
+convective_heat_transfer_coefficient = 35  # W/m^2 K
+material_emissivity = 0.7
+section_factors = {"contour_protection_section_factor": 150, "board_protection_section_factor": 110}  # 1/m
+
+
+def test_batch_steel_temperature_matches_scalar(sampled_rooms, fire_parameters):
+    zeta, room_length1, room_length2, room_height, fire_load = sampled_rooms
+    fire_curve = fire_curves.ParametricFireCurveBatch(zeta, *fire_parameters, room_length1, room_length2, room_height, fire_load)
+    thermal_analysis = thermal_analyses.SimplifiedUnprotected()
+    steel_temperature = thermal_analysis.get_component_temperature_batch(
+        fire_curve.time_array_seconds,
+        fire_curve.fire_temp(),
+        convective_heat_transfer_coefficient,
+        material_emissivity,
+        **section_factors,
+    )
+    for i in range(len(zeta)):
+        scalar_curve = fire_curves.ParametricFireCurve(
+            zeta[i], *fire_parameters, room_length1[i], room_length2[i], room_height[i], fire_load[i]
+        )
+        n_steps = len(scalar_curve.time_array_seconds)
+        scalar = thermal_analysis.get_component_temperature(
+            scalar_curve.time_array_seconds,
+            scalar_curve.fire_temp(),
+            convective_heat_transfer_coefficient,
+            material_emissivity,
+            **section_factors,
+        )
+        np.testing.assert_allclose(steel_temperature[i, :n_steps], scalar, rtol=1e-12)
+        # the NaN padding of the fire curve carries over
+        assert np.all(np.isnan(steel_temperature[i, n_steps:]))